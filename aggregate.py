@@ -0,0 +1,101 @@
+"""Накопительные суммы тренировок по пользователям за дни и недели."""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Hashable, Sequence, Tuple, Union
+
+from homework import read_package
+
+Timestamp = Union[datetime, float]
+
+
+@dataclass
+class Totals:
+    """Суммы показателей за период."""
+    count: int = 0
+    duration: float = 0.0
+    distance: float = 0.0
+    calories: float = 0.0
+
+    def add(self, duration: float, distance: float, calories: float) -> None:
+        """Учесть одну тренировку."""
+        self.count += 1
+        self.duration += duration
+        self.distance += distance
+        self.calories += calories
+
+    def merge(self, other: 'Totals') -> None:
+        """Прибавить суммы другого периода."""
+        self.count += other.count
+        self.duration += other.duration
+        self.distance += other.distance
+        self.calories += other.calories
+
+    @property
+    def mean_distance(self) -> float:
+        """Средняя дистанция одной тренировки."""
+        return self.distance / self.count if self.count else 0.0
+
+    @property
+    def mean_calories(self) -> float:
+        """Средние калории одной тренировки."""
+        return self.calories / self.count if self.count else 0.0
+
+
+def to_date(timestamp: Timestamp) -> date:
+    """Дата тренировки в UTC.
+
+    Числа считаются секундами Unix, datetime с часовым поясом переводится
+    в UTC, а datetime без пояса считается уже заданным в UTC.
+    """
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc)
+        return timestamp.date()
+    return datetime.fromtimestamp(timestamp, timezone.utc).date()
+
+
+class UserAggregates:
+    """Суммы по пользователям, обновляемые за O(1) на пакет.
+
+    Для каждого пользователя хранятся корзины по дням и по неделям ISO,
+    поэтому запрос за день или неделю не перебирает историю, а запрос за
+    произвольный период складывает только дневные корзины внутри него.
+    """
+
+    def __init__(self) -> None:
+        self.days: Dict[Tuple[Hashable, date], Totals] = {}
+        self.weeks: Dict[Tuple[Hashable, Tuple[int, int]], Totals] = {}
+
+    def add(self, user_id: Hashable, timestamp: Timestamp,
+            workout_type: str, data: Sequence[float]) -> None:
+        """Учесть пакет пользователя, пришедший в момент timestamp."""
+        training = read_package(workout_type, data)
+        values = (training.duration, training.get_distance(),
+                  training.get_spent_calories())
+        day = to_date(timestamp)
+        week = day.isocalendar()[:2]
+        totals = self.days.get((user_id, day))
+        if totals is None:
+            totals = self.days[(user_id, day)] = Totals()
+        totals.add(*values)
+        totals = self.weeks.get((user_id, week))
+        if totals is None:
+            totals = self.weeks[(user_id, week)] = Totals()
+        totals.add(*values)
+
+    def day(self, user_id: Hashable, day: date) -> Totals:
+        """Суммы пользователя за день."""
+        return self.days.get((user_id, day), Totals())
+
+    def week(self, user_id: Hashable, day: date) -> Totals:
+        """Суммы пользователя за неделю ISO, в которую входит day."""
+        return self.weeks.get((user_id, day.isocalendar()[:2]), Totals())
+
+    def window(self, user_id: Hashable, start: date, end: date) -> Totals:
+        """Суммы пользователя с start по end включительно."""
+        totals = Totals()
+        for offset in range((end - start).days + 1):
+            bucket = self.days.get((user_id, start + timedelta(offset)))
+            if bucket is not None:
+                totals.merge(bucket)
+        return totals
@@ -0,0 +1,222 @@
+"""Пакетный расчёт показателей тренировок по колонкам данных."""
+import json
+import math
+from collections import abc
+from dataclasses import asdict, dataclass, field
+from itertools import compress
+from typing import IO, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from homework import TRAINING_TYPES
+
+
+@dataclass
+class BatchResult:
+    """Показатели для пачки тренировок одного типа."""
+    training_type: str
+    duration: Sequence[float]
+    distance: List[float]
+    speed: List[float]
+    calories: List[Optional[float]]
+
+    def __len__(self) -> int:
+        return len(self.distance)
+
+
+def to_columns(rows: Iterable[Sequence[float]]) -> List[List[float]]:
+    """Развернуть пакеты одного типа в колонки."""
+    return [list(column) for column in zip(*rows)]
+
+
+def compute_batch(workout_type: str,
+                  columns: Sequence[Sequence[float]]) -> BatchResult:
+    """Посчитать показатели для колонок данных одного типа тренировки.
+
+    Колонки идут в том же порядке, что и параметры конструктора класса:
+    action, duration, weight и далее height или length_pool, count_pool.
+    Результаты совпадают с расчётом через объекты до последнего бита.
+    """
+    registered = TRAINING_TYPES.get(workout_type)
+    if registered is None:
+        raise ValueError('ошибка')
+    distance, speed, calories = registered.kernel(*columns)
+    return BatchResult(registered.training_class.__name__,
+                       columns[1], distance, speed, calories)
+
+
+def compute_packages(packages: Iterable[tuple]) -> Dict[str, BatchResult]:
+    """Сгруппировать пакеты по типу и посчитать каждую группу разом."""
+    groups: Dict[str, List[Sequence[float]]] = {}
+    for workout_type, data in packages:
+        groups.setdefault(workout_type, []).append(data)
+    return {workout_type: compute_batch(workout_type, to_columns(rows))
+            for workout_type, rows in groups.items()}
+
+
+# параметры, которые должны быть строго положительными
+POSITIVE_FIELDS = frozenset(('duration', 'height', 'length_pool'))
+_NUMBER_TYPES = (int, float)
+
+
+@dataclass
+class Rejection:
+    """Отброшенный пакет и причина."""
+    index: int  # номер пакета во входной пачке
+    workout_type: Optional[str]  # None, если пакет не разобрать на части
+    data: Sequence[float]
+    reason: str
+
+
+@dataclass
+class ValidatedBatch:
+    """Пачка пакетов, разделённая на корректные колонки и отказы."""
+    columns: Dict[str, List[List[float]]] = field(default_factory=dict)
+    indices: Dict[str, List[int]] = field(default_factory=dict)
+    rejected: List[Rejection] = field(default_factory=list)
+    # показатели, уже посчитанные при проверке на переполнение
+    results: Dict[str, BatchResult] = field(default_factory=dict)
+
+    def compute(self) -> Dict[str, BatchResult]:
+        """Посчитать показатели только для корректных пакетов."""
+        return {workout_type: self.results.get(workout_type)
+                or compute_batch(workout_type, columns)
+                for workout_type, columns in self.columns.items()}
+
+
+def _reason(name: str, value: object, positive: bool) -> Optional[str]:
+    """Вернуть причину отказа для одного значения или None."""
+    if type(value) not in _NUMBER_TYPES:
+        return f'{name}:not_number'
+    if value != value:
+        return f'{name}:nan'
+    if positive and value <= 0:
+        return f'{name}:not_positive'
+    return None
+
+
+def _split_package(package: object) -> Optional[str]:
+    """Вернуть код пакета, если пакет — пара из кода и параметров."""
+    if not isinstance(package, (tuple, list)) or len(package) != 2:
+        return None
+    workout_type, data = package
+    if (not isinstance(workout_type, str)
+            or not isinstance(data, abc.Sequence)
+            or isinstance(data, (str, bytes))):
+        return None
+    return workout_type
+
+
+def validate_packages(packages: Iterable[tuple],
+                      rejects: Optional[IO[str]] = None) -> ValidatedBatch:
+    """Проверить пачку пакетов без исключений на каждую запись.
+
+    Пакеты, которые не разбираются на строковый код и список
+    параметров, неизвестный код и неверное число параметров отсекаются
+    при группировке, остальные проверки идут по колонкам: числа, NaN и
+    положительность duration, height и length_pool. Затем группа
+    считается, и отсекаются строки, где скорость или калории вышли за
+    пределы float; посчитанное возвращает `ValidatedBatch.compute`.
+    Причина отказа — ``malformed``, ``unknown_type``, ``arity`` или
+    ``<поле>:<проверка>``, например ``duration:not_positive`` или
+    ``speed:overflow``. Отказы пишутся в rejects строками JSON.
+    """
+    batch = ValidatedBatch()
+    groups: Dict[str, List[Sequence[float]]] = {}
+    for index, package in enumerate(packages):
+        workout_type = _split_package(package)
+        if workout_type is None:
+            batch.rejected.append(
+                Rejection(index, None, package, 'malformed'))
+            continue
+        data = package[1]
+        registered = TRAINING_TYPES.get(workout_type)
+        if registered is None or len(data) != registered.arity:
+            reason = 'unknown_type' if registered is None else 'arity'
+            batch.rejected.append(
+                Rejection(index, workout_type, data, reason))
+            continue
+        batch.indices.setdefault(workout_type, []).append(index)
+        groups.setdefault(workout_type, []).append(data)
+    for workout_type, rows in groups.items():
+        _split_group(batch, workout_type, rows)
+    batch.rejected.sort(key=lambda rejection: rejection.index)
+    if rejects is not None:
+        # в неразобранном пакете могут быть значения, которых нет в JSON
+        rejects.writelines(
+            json.dumps(asdict(rejection), default=repr) + '\n'
+            for rejection in batch.rejected)
+    return batch
+
+
+def _split_group(batch: ValidatedBatch, workout_type: str,
+                 rows: List[Sequence[float]]) -> None:
+    """Проверить колонки одного типа и разложить строки по результату."""
+    columns = to_columns(rows)
+    reasons: List[Optional[str]] = [None] * len(rows)
+    for name, column in zip(TRAINING_TYPES[workout_type].fields, columns):
+        positive = name in POSITIVE_FIELDS
+        reasons = [reason or _reason(name, value, positive)
+                   for reason, value in zip(reasons, column)]
+    indices = batch.indices.pop(workout_type)
+    indices, rows, columns = _drop_rejected(
+        batch, workout_type, reasons, indices, rows, columns)
+    if not indices:
+        return
+    result, reasons = _checked_metrics(workout_type, columns)
+    if result is None or any(reasons):
+        indices, rows, columns = _drop_rejected(
+            batch, workout_type, reasons, indices, rows, columns)
+        if not indices:
+            return
+        result = compute_batch(workout_type, columns)
+    batch.indices[workout_type] = indices
+    batch.columns[workout_type] = columns
+    batch.results[workout_type] = result
+
+
+def _drop_rejected(batch: ValidatedBatch, workout_type: str,
+                   reasons: List[Optional[str]], indices: List[int],
+                   rows: List[Sequence[float]], columns: List[List[float]],
+                   ) -> Tuple[List[int], List[Sequence[float]],
+                              List[List[float]]]:
+    """Записать отказы и оставить только строки без причины отказа."""
+    keep = [reason is None for reason in reasons]
+    if all(keep):
+        return indices, rows, columns
+    batch.rejected.extend(
+        Rejection(index, workout_type, data, reason)
+        for index, data, reason in zip(indices, rows, reasons)
+        if reason is not None)
+    return (list(compress(indices, keep)), list(compress(rows, keep)),
+            [list(compress(column, keep)) for column in columns])
+
+
+def _checked_metrics(workout_type: str, columns: List[List[float]],
+                     ) -> Tuple[Optional[BatchResult], List[Optional[str]]]:
+    """Посчитать группу и найти строки с бесконечными показателями.
+
+    Если пакетный расчёт переполнился, результата нет, а строки
+    пересчитываются по одной, чтобы найти переполняющиеся.
+    """
+    try:
+        result = compute_batch(workout_type, columns)
+    except ArithmeticError:
+        return None, [_row_reason(workout_type, row)
+                      for row in zip(*columns)]
+    return result, [_metrics_reason(speed, calories) for speed, calories
+                    in zip(result.speed, result.calories)]
+
+
+def _row_reason(workout_type: str, row: Sequence[float]) -> Optional[str]:
+    try:
+        result = compute_batch(workout_type, [[value] for value in row])
+    except ArithmeticError:
+        return 'speed:overflow'
+    return _metrics_reason(result.speed[0], result.calories[0])
+
+
+def _metrics_reason(speed: float, calories: Optional[float]) -> Optional[str]:
+    if not math.isfinite(speed):
+        return 'speed:overflow'
+    if calories is not None and not math.isfinite(calories):
+        return 'calories:overflow'
+    return None
@@ -0,0 +1,188 @@
+"""Замеры скорости горячих участков `homework`.
+
+Для каждого типа тренировки генерируются синтетические пакеты, и каждая
+стадия (разбор строки, `read_package`, расчёт калорий, `show_training_info`,
+`get_message`, пакетный расчёт и массовое форматирование) прогоняется
+блоками; по суммарному времени блоков считается пропускная способность —
+пакеты в секунду. Задержки p50 и p99 считаются по отдельным пакетам: до
+``LATENCY_SAMPLES`` пакетов, взятых с равным шагом, проходят стадию по
+одному и замеряются `time.perf_counter_ns`. Пакеты генерируются
+блоками, поэтому даже 1e7 пакетов не требуют держать всё в памяти.
+
+    python bench.py --sizes 1e3 1e5 --save baseline.json
+    python bench.py --sizes 1e3 1e5 --baseline baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from batch import compute_batch
+from homework import read_package
+from report import format_messages
+from stream import parse_json
+
+BLOCK_SIZE = 1000
+LATENCY_SAMPLES = 1000
+WORKOUT_TYPES = ('SWM', 'RUN', 'WLK')
+
+Stage = Tuple[Callable[[list], object], Callable[[object], object]]
+
+
+def generate_packages(workout_type: str, count: int,
+                      seed: int = 0) -> Iterator[tuple]:
+    """Сгенерировать правдоподобные пакеты одного типа."""
+    rnd = random.Random(seed)
+    for _ in range(count):
+        data = [rnd.randint(500, 40000), rnd.uniform(0.2, 3),
+                rnd.uniform(45, 110)]
+        if workout_type == 'WLK':
+            data.append(rnd.uniform(150, 200))
+        elif workout_type == 'SWM':
+            data.extend([rnd.choice((25, 50)), rnd.randint(10, 80)])
+        yield workout_type, data
+
+
+def generate_blocks(workout_type: str, count: int,
+                    block_size: int = BLOCK_SIZE) -> Iterator[list]:
+    """Нарезать сгенерированные пакеты на блоки."""
+    block: list = []
+    for package in generate_packages(workout_type, count):
+        block.append(package)
+        if len(block) == block_size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _trainings(block: list) -> list:
+    return [read_package(*package) for package in block]
+
+
+def _infos(block: list) -> list:
+    return [training.show_training_info() for training in _trainings(block)]
+
+
+STAGES: Dict[str, Stage] = {
+    'parse': (lambda block: [json.dumps(package) for package in block],
+              lambda lines: [parse_json(line) for line in lines]),
+    'read_package': (lambda block: block,
+                     lambda block: [read_package(*package)
+                                    for package in block]),
+    'get_spent_calories': (_trainings,
+                           lambda trainings: [training.get_spent_calories()
+                                              for training in trainings]),
+    'show_training_info': (_trainings,
+                           lambda trainings: [training.show_training_info()
+                                              for training in trainings]),
+    'get_message': (_infos,
+                    lambda infos: [info.get_message() for info in infos]),
+    'format_messages': (_infos, lambda infos: list(format_messages(infos))),
+    'compute_batch': (lambda block: (block[0][0],
+                                     [list(column) for column in
+                                      zip(*(data for _, data in block))]),
+                      lambda prepared: compute_batch(*prepared)),
+}
+
+
+def _percentile(ordered: Sequence[float], share: float) -> float:
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+
+def measure(stage: str, workout_type: str, count: int,
+            block_size: int = BLOCK_SIZE) -> Dict[str, float]:
+    """Замерить одну стадию на count пакетах одного типа."""
+    prepare, run = STAGES[stage]
+    clock = time.perf_counter_ns
+    stride = max(1, count // LATENCY_SAMPLES)
+    latencies: List[int] = []
+    total = seen = 0
+    for block in generate_blocks(workout_type, count, block_size):
+        prepared = prepare(block)
+        started = clock()
+        run(prepared)
+        total += clock() - started
+        # задержка — по отдельным пакетам, а не средняя по блоку
+        for package in block[-seen % stride::stride]:
+            prepared = prepare([package])
+            started = clock()
+            run(prepared)
+            latencies.append(clock() - started)
+        seen += len(block)
+    latencies.sort()
+    return {
+        'packets': count,
+        'per_second': count / total * 1e9 if total else float('inf'),
+        'p50_us': _percentile(latencies, 0.5) / 1e3,
+        'p99_us': _percentile(latencies, 0.99) / 1e3,
+    }
+
+
+def run_suite(sizes: Sequence[int],
+              stages: Sequence[str] = tuple(STAGES),
+              workout_types: Sequence[str] = WORKOUT_TYPES,
+              block_size: int = BLOCK_SIZE) -> Dict[str, dict]:
+    """Прогнать все стадии для всех размеров и типов тренировок."""
+    results = {}
+    for size in sizes:
+        for workout_type in workout_types:
+            for stage in stages:
+                results[f'{stage}/{workout_type}/{size}'] = measure(
+                    stage, workout_type, size, block_size)
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict],
+            threshold: float) -> List[str]:
+    """Найти замеры, где пропускная способность упала больше порога."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        limit = reference['per_second'] * (1 - threshold)
+        if result['per_second'] < limit:
+            regressions.append(
+                f'{key}: {result["per_second"]:.0f}/с, '
+                f'было {reference["per_second"]:.0f}/с')
+    return regressions
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['1e3', '1e4', '1e5'],
+                        help='число пакетов, например 1e3 1e7')
+    parser.add_argument('--stages', nargs='+', choices=tuple(STAGES),
+                        default=list(STAGES))
+    parser.add_argument('--types', nargs='+', choices=WORKOUT_TYPES,
+                        default=list(WORKOUT_TYPES))
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE)
+    parser.add_argument('--save', help='сохранить замеры как базовые')
+    parser.add_argument('--baseline', help='файл с базовыми замерами')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='допустимое падение скорости, доля')
+    args = parser.parse_args(argv)
+    sizes = [int(float(size)) for size in args.sizes]
+    results = run_suite(sizes, args.stages, args.types, args.block_size)
+    for key, result in results.items():
+        print(f'{key:<40} {result["per_second"]:>14,.0f}/с '
+              f'p50 {result["p50_us"]:8.2f} мкс '
+              f'p99 {result["p99_us"]:8.2f} мкс')
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as sink:
+            json.dump(results, sink, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as source:
+            regressions = compare(results, json.load(source), args.threshold)
+        for regression in regressions:
+            print(f'ЗАМЕДЛЕНИЕ {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
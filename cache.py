@@ -0,0 +1,114 @@
+"""Кэш результатов для повторно переданных пакетов."""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from homework import InfoMessage, read_package
+
+DEFAULT_MAXSIZE = 65536
+DEFAULT_SHARDS = 16
+# меньше стольких записей на сегмент кэш не делится
+MIN_SHARD_SIZE = 16
+
+
+class _Shard:
+    """Один сегмент кэша: свой словарь, своя очередь LRU и своя блокировка."""
+
+    __slots__ = ('maxsize', 'hits', 'misses', 'evictions', 'data', 'lock')
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.data: 'OrderedDict[Tuple, InfoMessage]' = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class ResultCache:
+    """Ограниченный LRU-кэш сообщений по содержимому пакета.
+
+    Ключ — `(workout_type, tuple(data))`, поэтому повторно присланный пакет
+    не пересчитывается. Сообщения из кэша общие для всех обращений и не
+    должны изменяться вызывающим кодом.
+
+    Кэш разделён на ``shards`` сегментов по хешу ключа, у каждого своя
+    блокировка и своя часть maxsize, поэтому потоки, обращающиеся к разным
+    пакетам, почти не ждут друг друга. Вытесняется самая давно
+    использованная запись своего сегмента. По умолчанию сегментов
+    `DEFAULT_SHARDS`, но не меньше `MIN_SHARD_SIZE` записей на сегмент:
+    маленький кэш остаётся одним точным LRU.
+
+    Словарь и счётчики сегмента меняются под его блокировкой, а расчёт при
+    промахе идёт вне её. Если два потока одновременно промахнулись по
+    одному пакету, оба посчитают его, и в кэше останется один из
+    одинаковых результатов.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE,
+                 shards: Optional[int] = None) -> None:
+        if maxsize < 1:
+            raise ValueError('размер кэша должен быть положительным')
+        if shards is None:
+            shards = max(1, min(DEFAULT_SHARDS, maxsize // MIN_SHARD_SIZE))
+        if not 1 <= shards <= maxsize:
+            raise ValueError('число сегментов должно быть от 1 до maxsize')
+        self.maxsize = maxsize
+        size, extra = divmod(maxsize, shards)
+        self._shards: List[_Shard] = [
+            _Shard(size + (index < extra)) for index in range(shards)]
+
+    def get_info(self, workout_type: str,
+                 data: Sequence[float]) -> InfoMessage:
+        """Вернуть сообщение для пакета, посчитав его при промахе."""
+        key = (workout_type, tuple(data))
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            info = shard.data.get(key)
+            if info is not None:
+                shard.hits += 1
+                shard.data.move_to_end(key)
+                return info
+            shard.misses += 1
+        info = read_package(workout_type, data).show_training_info()
+        with shard.lock:
+            shard.data[key] = info
+            shard.data.move_to_end(key)
+            if len(shard.data) > shard.maxsize:
+                shard.data.popitem(last=False)
+                shard.evictions += 1
+        return info
+
+    def __len__(self) -> int:
+        return sum(len(shard.data) for shard in self._shards)
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self._shards)
+
+    def stats(self) -> Dict[str, int]:
+        """Счётчики попаданий, промахов и вытеснений."""
+        totals = {'size': 0, 'maxsize': self.maxsize, 'hits': 0,
+                  'misses': 0, 'evictions': 0}
+        for shard in self._shards:
+            with shard.lock:
+                totals['size'] += len(shard.data)
+                totals['hits'] += shard.hits
+                totals['misses'] += shard.misses
+                totals['evictions'] += shard.evictions
+        return totals
+
+    def clear(self) -> None:
+        """Очистить кэш и обнулить счётчики."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.data.clear()
+                shard.hits = shard.misses = shard.evictions = 0
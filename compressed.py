@@ -0,0 +1,162 @@
+"""Чтение сжатых архивов пакетов большими блоками.
+
+Поддерживаются форматы стандартной библиотеки: gzip, bzip2 и xz/lzma.
+Архивы bzip2 и xz распаковываются потоком блоками по ``block_size``
+байт. Архив gzip может состоять из нескольких независимых членов (так
+получается при склейке файлов или записи кусками), поэтому сжатые данные
+режутся на куски по сигнатуре члена, и куски распаковываются параллельно
+в потоках: zlib отпускает GIL на время распаковки. Сигнатура может
+случайно встретиться внутри сжатых данных, так что результат куска
+принимается, только если он разобрался в целые члены с верными
+контрольными суммами; иначе кусок распаковывается последовательно, как
+продолжение предыдущего. В памяти одновременно держится лишь окно из
+нескольких кусков, а строки, разорванные границей блока, склеиваются.
+"""
+import bz2
+import codecs
+import lzma
+import os
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import IO, Deque, Iterable, Iterator, Optional, Tuple
+
+GZIP_MAGIC = b'\x1f\x8b\x08'
+# окно zlib для данных с заголовком и контрольной суммой gzip
+GZIP_WBITS = 31
+BLOCK_SIZE = 1 << 20
+# модули потоковой распаковки по расширению файла
+STREAMS = {'.bz2': bz2, '.xz': lzma, '.lzma': lzma}
+SUFFIXES = ('.gz', *STREAMS)
+
+
+def iter_segments(file: IO[bytes], block_size: int) -> Iterator[bytes]:
+    """Нарезать сжатый поток на куски, начинающиеся с сигнатуры gzip."""
+    pending = b''
+    while True:
+        block = file.read(block_size)
+        if not block:
+            break
+        pending += block
+        cut = pending.rfind(GZIP_MAGIC, 1)
+        if cut < 0:
+            # внутри длинного члена; кусок уйдёт на последовательную
+            # распаковку, зато память остаётся ограниченной
+            cut = len(pending)
+        yield pending[:cut]
+        pending = pending[cut:]
+    if pending:
+        yield pending
+
+
+def inflate_members(segment: bytes) -> Optional[bytes]:
+    """Распаковать кусок из целых членов gzip; None, если он не таков."""
+    parts = []
+    try:
+        # нули после члена — дополнение, которое пропускает и модуль gzip
+        segment = segment.lstrip(b'\0')
+        while segment:
+            decoder = zlib.decompressobj(GZIP_WBITS)
+            parts.append(decoder.decompress(segment))
+            if not decoder.eof:
+                return None
+            segment = decoder.unused_data.lstrip(b'\0')
+    except zlib.error:
+        return None
+    return b''.join(parts)
+
+
+class _Sequential:
+    """Последовательная распаковка gzip с переносом состояния между кусками."""
+
+    def __init__(self) -> None:
+        # None означает, что предыдущий член закончился ровно на границе
+        self.decoder: Optional['zlib._Decompress'] = None
+
+    def feed(self, data: bytes) -> bytes:
+        parts = []
+        while data:
+            if self.decoder is None:
+                data = data.lstrip(b'\0')
+                if not data:
+                    break
+                self.decoder = zlib.decompressobj(GZIP_WBITS)
+            parts.append(self.decoder.decompress(data))
+            if not self.decoder.eof:
+                break
+            data = self.decoder.unused_data
+            self.decoder = None
+        return b''.join(parts)
+
+
+def iter_gzip_blocks(file: IO[bytes],
+                     workers: Optional[int] = None,
+                     block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Распакованные блоки gzip по порядку, с распаковкой в потоках."""
+    window = 2 * (workers or os.cpu_count() or 1)
+    pending: Deque[Tuple[bytes, Future]] = deque()
+    sequential = _Sequential()
+
+    def take() -> bytes:
+        segment, future = pending.popleft()
+        if sequential.decoder is None:
+            inflated = future.result()
+            if inflated is not None:
+                return inflated
+        return sequential.feed(segment)
+
+    with ThreadPoolExecutor(workers) as pool:
+        for segment in iter_segments(file, block_size):
+            pending.append((segment, pool.submit(inflate_members, segment)))
+            if len(pending) >= window:
+                yield take()
+        while pending:
+            yield take()
+    if sequential.decoder is not None:
+        raise EOFError('архив gzip оборван')
+
+
+def iter_blocks(file: IO[bytes], block_size: int) -> Iterator[bytes]:
+    """Читать поток блоками по block_size байт."""
+    return iter(lambda: file.read(block_size), b'')
+
+
+def iter_lines(blocks: Iterable[bytes]) -> Iterator[str]:
+    """Строки текста UTF-8, склеенные через границы блоков."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    carry = ''
+    for block in blocks:
+        lines = (carry + decoder.decode(block)).split('\n')
+        carry = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    carry += decoder.decode(b'', final=True)
+    if carry:
+        yield carry
+
+
+def compression(path: str) -> Optional[str]:
+    """Расширение сжатия в имени файла или None."""
+    suffix = os.path.splitext(path)[1]
+    return suffix if suffix in SUFFIXES else None
+
+
+@contextmanager
+def open_archive(path: str,
+                 workers: Optional[int] = None,
+                 block_size: int = BLOCK_SIZE) -> Iterator[Iterator[str]]:
+    """Открыть сжатый архив как последовательность строк."""
+    suffix = compression(path)
+    if suffix is None:
+        raise ValueError(f'неизвестный формат сжатия: {path}')
+    if suffix == '.gz':
+        with open(path, 'rb') as file:
+            blocks = iter_gzip_blocks(file, workers, block_size)
+            try:
+                yield iter_lines(blocks)
+            finally:
+                blocks.close()
+    else:
+        with STREAMS[suffix].open(path, 'rb') as file:
+            yield iter_lines(iter_blocks(file, block_size))
@@ -0,0 +1,167 @@
+"""Постоянный локальный обработчик пакетов и тонкий клиент к нему.
+
+Запуск интерпретатора и импорт модулей обходятся дороже расчёта
+нескольких пакетов, поэтому для частых коротких вызовов (хуки cron)
+обработчик держится запущенным: ``python daemon.py start`` поднимает
+`server.TrainingServer` на Unix-сокете, а ``python daemon.py send``
+передаёт ему пакеты JSON Lines со стандартного ввода и печатает ответы
+с полями `InfoMessage`. Клиентская часть модуля импортирует только
+стандартную библиотеку и не загружает `homework`.
+
+``python daemon.py bench`` сравнивает задержку холодного запуска
+``python homework.py`` с вызовом клиента и с запросом из уже запущенного
+процесса.
+"""
+import os
+import socket
+import sys
+import time
+from typing import Iterable, List, Optional, Sequence
+
+DEFAULT_SOCKET = os.environ.get(
+    'TRAINING_SOCKET', f'/tmp/training-{os.getuid()}.sock')
+HOMEWORK = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'homework.py')
+SAMPLE = (b'["SWM", [720, 1, 80, 25, 40]]\n'
+          b'["RUN", [15000, 1, 75]]\n'
+          b'["WLK", [9000, 1, 75, 180]]\n')
+
+
+def request(lines: Iterable[bytes],
+            path: str = DEFAULT_SOCKET,
+            timeout: float = 5.0) -> List[bytes]:
+    """Отправить пакеты обработчику и вернуть строки ответов по порядку."""
+    replies = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        with sock.makefile('rb') as reader:
+            # по пакету за раз: ответы не копятся в буферах сокета
+            for line in lines:
+                if not line.strip():
+                    continue
+                sock.sendall(line if line.endswith(b'\n') else line + b'\n')
+                reply = reader.readline()
+                if not reply:
+                    raise ConnectionError('обработчик закрыл соединение')
+                replies.append(reply)
+    return replies
+
+
+def is_running(path: str = DEFAULT_SOCKET) -> bool:
+    """Принимает ли обработчик соединения на сокете."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def wait_ready(path: str = DEFAULT_SOCKET, timeout: float = 10.0) -> None:
+    """Дождаться, пока обработчик начнёт принимать соединения."""
+    deadline = time.monotonic() + timeout
+    while not is_running(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f'обработчик не запустился на {path}')
+        time.sleep(0.01)
+
+
+async def _serve(path: str, mode: str, workers: int) -> None:
+    import asyncio
+    import signal
+
+    from server import TrainingServer
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    # обработчики сигналов ставятся до того, как сокет начнёт принимать
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    server = TrainingServer(mode, workers=workers)
+    await server.start_unix(path)
+    os.chmod(path, 0o600)
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def start(path: str = DEFAULT_SOCKET, mode: str = 'fields',
+          workers: int = 4) -> None:
+    """Запустить обработчик и работать до SIGINT или SIGTERM."""
+    import asyncio
+
+    if is_running(path):
+        raise RuntimeError(f'обработчик уже запущен на {path}')
+    if os.path.exists(path):
+        # сокет остался от процесса, завершившегося аварийно
+        os.unlink(path)
+    asyncio.run(_serve(path, mode, workers))
+
+
+def _timings(command: Sequence[str], payload: bytes,
+             repeat: int) -> List[float]:
+    import subprocess
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, input=payload, stdout=subprocess.DEVNULL,
+                       check=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _summary(timings: List[float]) -> dict:
+    ordered = sorted(timings)
+    return {'p50_ms': ordered[len(ordered) // 2] * 1000,
+            'min_ms': ordered[0] * 1000}
+
+
+def bench(path: str = DEFAULT_SOCKET, repeat: int = 20,
+          payload: bytes = SAMPLE) -> dict:
+    """Задержки холодного запуска, клиента и запроса к обработчику."""
+    cold = _timings([sys.executable, HOMEWORK, '-'], payload, repeat)
+    client = _timings([sys.executable, os.path.abspath(__file__),
+                       'send', '--socket', path], payload, repeat)
+    lines = payload.splitlines(keepends=True)
+    warm = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request(lines, path)
+        warm.append(time.perf_counter() - started)
+    return {'packets': len(lines), 'cold_start': _summary(cold),
+            'client': _summary(client), 'in_process': _summary(warm)}
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа командной строки."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=('start', 'send', 'bench'))
+    parser.add_argument('--socket', default=DEFAULT_SOCKET,
+                        help='путь к Unix-сокету обработчика')
+    parser.add_argument('--mode', choices=('text', 'fields'),
+                        default='fields', help='вид ответа обработчика')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='сколько раз повторять замер')
+    args = parser.parse_args(argv)
+    if args.command == 'start':
+        start(args.socket, args.mode, args.workers)
+    elif args.command == 'send':
+        sys.stdout.buffer.writelines(
+            request(sys.stdin.buffer, args.socket))
+    else:
+        import json
+
+        print(json.dumps(bench(args.socket, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
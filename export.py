@@ -0,0 +1,301 @@
+"""Выгрузка показателей тренировок колонками для аналитики.
+
+Вместо текста `InfoMessage.get_message` выгружаются сами поля:
+training_type, duration, distance, speed и calories — в CSV с
+заголовком, в JSON Lines или в компактный двоичный колоночный файл.
+Данные пишутся пачками по ``batch_size`` строк, по одной записи в поток
+на пачку. Источник — поток `InfoMessage`, результаты пакетного расчёта
+`batch.BatchResult`, которые уже лежат колонками, или сами пакеты: их
+`iter_package_columns` считает пакетно и раскладывает обратно в порядке
+входа. Бесконечности и NaN в CSV и JSON Lines пишутся пустым значением
+и null.
+
+Двоичный файл начинается с заголовка ``HWCX``, версии и числа колонок,
+за ним идут блоки. Блок — число строк и число названий типов, названия
+(байт длины и UTF-8), коды типов по байту на строку и четыре колонки
+float64 little-endian: duration, distance, speed, calories. Калории,
+которые не посчитаны, хранятся как NaN.
+"""
+import argparse
+import json
+import math
+import struct
+import sys
+from array import array
+from itertools import islice, repeat
+from operator import attrgetter
+from typing import (IO, BinaryIO, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Sequence, Tuple, Union)
+
+from batch import BatchResult, compute_batch, to_columns
+from homework import InfoMessage
+from stream import (Package, detect_format, iter_chunks, iter_packets,
+                    open_source)
+
+COLUMNS = ('training_type', 'duration', 'distance', 'speed', 'calories')
+FORMATS = ('csv', 'jsonl', 'binary')
+DEFAULT_BATCH_SIZE = 65536
+JSON_ROW = ('{"training_type": %s, "duration": %s, "distance": %s, '
+            '"speed": %s, "calories": %s}')
+
+MAGIC = b'HWCX'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+BLOCK = struct.Struct('<II')
+NAME = struct.Struct('<B')
+_SWAP = sys.byteorder != 'little'
+
+# колонка типов: по названию на строку или одно название на всю пачку
+TypeColumn = Union[str, Sequence[str]]
+Columns = Tuple[TypeColumn, Sequence[float], Sequence[float],
+                Sequence[float], Sequence[Optional[float]]]
+
+_fields = attrgetter(*COLUMNS)
+
+
+def iter_info_columns(infos: Iterable[InfoMessage],
+                      batch_size: int = DEFAULT_BATCH_SIZE,
+                      ) -> Iterator[Columns]:
+    """Разложить поток сообщений на пачки колонок."""
+    infos = iter(infos)
+    while True:
+        chunk = list(map(_fields, islice(infos, batch_size)))
+        if not chunk:
+            return
+        yield tuple(map(list, zip(*chunk)))
+
+
+def iter_result_columns(results: Iterable[BatchResult],
+                        batch_size: int = DEFAULT_BATCH_SIZE,
+                        ) -> Iterator[Columns]:
+    """Нарезать результаты пакетного расчёта на пачки колонок."""
+    for result in results:
+        for start in range(0, len(result), batch_size):
+            stop = start + batch_size
+            yield (result.training_type, result.duration[start:stop],
+                   result.distance[start:stop], result.speed[start:stop],
+                   result.calories[start:stop])
+
+
+def iter_package_columns(packages: Iterable[Package],
+                         batch_size: int = DEFAULT_BATCH_SIZE,
+                         ) -> Iterator[Columns]:
+    """Посчитать пакеты пачками и вернуть колонки в порядке пакетов.
+
+    Внутри пачки пакеты считаются по группам одного типа, а результаты
+    раскладываются обратно на места исходных пакетов.
+    """
+    for chunk in iter_chunks(packages, batch_size):
+        groups: Dict[str, List[int]] = {}
+        for position, (workout_type, _) in enumerate(chunk):
+            groups.setdefault(workout_type, []).append(position)
+        if len(groups) == 1:
+            workout_type, = groups
+            result = compute_batch(workout_type,
+                                   to_columns(data for _, data in chunk))
+            yield (result.training_type, result.duration, result.distance,
+                   result.speed, result.calories)
+            continue
+        columns: List[list] = [[None] * len(chunk) for _ in COLUMNS]
+        for workout_type, positions in groups.items():
+            result = compute_batch(workout_type, to_columns(
+                chunk[position][1] for position in positions))
+            values = (repeat(result.training_type), result.duration,
+                      result.distance, result.speed, result.calories)
+            for column, group in zip(columns, values):
+                for position, value in zip(positions, group):
+                    column[position] = value
+        yield tuple(columns)
+
+
+def _names(training_type: TypeColumn, count: int,
+           encode: Callable[[str], str]) -> Iterable[str]:
+    """Колонка типов, в которой каждое название закодировано один раз."""
+    if isinstance(training_type, str):
+        return repeat(encode(training_type), count)
+    encoded = {name: encode(name) for name in set(training_type)}
+    return map(encoded.__getitem__, training_type)
+
+
+def _text_columns(metrics: Sequence[Sequence[Optional[float]]],
+                  missing: str) -> List[Iterable[str]]:
+    """Числовые колонки как текст; repr даёт кратчайшую точную запись.
+
+    Непосчитанные калории, бесконечности и NaN заменяются на missing.
+    """
+    columns: List[Iterable[str]] = []
+    for values in metrics:
+        if None in values or not all(map(math.isfinite, values)):
+            columns.append([
+                repr(value) if value is not None and math.isfinite(value)
+                else missing for value in values])
+        else:
+            columns.append(map(repr, values))
+    return columns
+
+
+def _csv_name(name: str) -> str:
+    if any(char in name for char in ',"\r\n'):
+        return '"' + name.replace('"', '""') + '"'
+    return name
+
+
+def write_csv(chunks: Iterable[Columns], sink: IO[str]) -> int:
+    """Записать колонки в CSV с заголовком и вернуть число строк.
+
+    Строки собираются по колонкам: числа переводятся в текст целой
+    колонкой, это почти вдвое быстрее `csv.writer`.
+    """
+    sink.write(','.join(COLUMNS) + '\n')
+    count = 0
+    for training_type, *metrics in chunks:
+        size = len(metrics[0])
+        if not size:
+            continue
+        rows = zip(_names(training_type, size, _csv_name),
+                   *_text_columns(metrics, ''))
+        sink.write('\n'.join(map(','.join, rows)) + '\n')
+        count += size
+    return count
+
+
+def _json_name(name: str) -> str:
+    return json.dumps(name, ensure_ascii=False)
+
+
+def write_jsonl(chunks: Iterable[Columns], sink: IO[str]) -> int:
+    """Записать колонки в JSON Lines и вернуть число строк."""
+    count = 0
+    for training_type, *metrics in chunks:
+        size = len(metrics[0])
+        if not size:
+            continue
+        rows = zip(_names(training_type, size, _json_name),
+                   *_text_columns(metrics, 'null'))
+        sink.write('\n'.join(map(JSON_ROW.__mod__, rows)) + '\n')
+        count += size
+    return count
+
+
+def _float_column(values: Sequence[Optional[float]]) -> bytes:
+    if None in values:
+        values = [math.nan if value is None else value for value in values]
+    column = array('d', values)
+    if _SWAP:
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_binary(chunks: Iterable[Columns], sink: BinaryIO) -> int:
+    """Записать колонки в двоичный файл и вернуть число строк."""
+    sink.write(HEADER.pack(MAGIC, VERSION, len(COLUMNS)))
+    count = 0
+    for training_type, *metrics in chunks:
+        size = len(metrics[0])
+        if isinstance(training_type, str):
+            names, codes = [training_type], bytes(size)
+        else:
+            index = {name: code for code, name in
+                     enumerate(dict.fromkeys(training_type))}
+            if len(index) > 255:
+                raise ValueError('в пачке больше 255 типов тренировок')
+            names, codes = list(index), bytes(map(index.get, training_type))
+        parts = [BLOCK.pack(size, len(names))]
+        for name in names:
+            encoded = name.encode()
+            parts.append(NAME.pack(len(encoded)) + encoded)
+        parts.append(codes)
+        parts.extend(_float_column(values) for values in metrics)
+        sink.write(b''.join(parts))
+        count += size
+    return count
+
+
+def _read_exact(source: BinaryIO, size: int) -> bytes:
+    data = source.read(size)
+    if len(data) != size:
+        raise ValueError('двоичный файл оборван')
+    return data
+
+
+def read_binary(source: BinaryIO) -> Iterator[Columns]:
+    """Прочитать блоки двоичного файла как пачки колонок.
+
+    Колонка типов возвращается списком названий, числовые — `array('d')`.
+    """
+    magic, version, columns = HEADER.unpack(_read_exact(source, HEADER.size))
+    if magic != MAGIC or version != VERSION or columns != len(COLUMNS):
+        raise ValueError('это не файл колонок тренировок')
+    while True:
+        head = source.read(BLOCK.size)
+        if not head:
+            return
+        if len(head) != BLOCK.size:
+            raise ValueError('двоичный файл оборван')
+        size, count = BLOCK.unpack(head)
+        names = []
+        for _ in range(count):
+            length, = NAME.unpack(_read_exact(source, NAME.size))
+            names.append(_read_exact(source, length).decode())
+        codes = _read_exact(source, size)
+        metrics: List[array] = []
+        for _ in range(len(COLUMNS) - 1):
+            column = array('d')
+            column.frombytes(_read_exact(source, size * column.itemsize))
+            if _SWAP:
+                column.byteswap()
+            metrics.append(column)
+        yield ([names[code] for code in codes], *metrics)
+
+
+_WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'binary': write_binary}
+
+
+def export_infos(infos: Iterable[InfoMessage], sink: IO,
+                 fmt: str = 'csv',
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Выгрузить поля сообщений; для binary sink открыт в режиме байтов."""
+    return _WRITERS[fmt](iter_info_columns(infos, batch_size), sink)
+
+
+def export_packages(packages: Iterable[Package], sink: IO,
+                    fmt: str = 'csv',
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Посчитать пакеты пакетно и выгрузить строки в порядке пакетов."""
+    return _WRITERS[fmt](iter_package_columns(packages, batch_size), sink)
+
+
+def export_results(results: Iterable[BatchResult], sink: IO,
+                   fmt: str = 'csv',
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Выгрузить результаты пакетного расчёта без создания объектов."""
+    return _WRITERS[fmt](iter_result_columns(results, batch_size), sink)
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Выгрузка показателей тренировок колонками.')
+    parser.add_argument('path', help='файл с пакетами, - для stdin')
+    parser.add_argument('--output', required=True, help='файл выгрузки')
+    parser.add_argument('--to', choices=FORMATS, default='csv',
+                        help='формат выгрузки')
+    parser.add_argument('--format', choices=('jsonl', 'csv'),
+                        help='формат входа, по умолчанию по расширению')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='сколько пакетов считать и писать за раз')
+    args = parser.parse_args(argv)
+    fmt = args.format or detect_format(args.path)
+    if args.to == 'binary':
+        output = open(args.output, 'wb')
+    else:
+        output = open(args.output, 'w', encoding='utf-8', newline='')
+    with open_source(args.path) as source, output:
+        count = export_packages(iter_packets(source, fmt), output, args.to,
+                                args.batch_size)
+    print(f'выгружено строк: {count}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
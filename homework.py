@@ -1,7 +1,21 @@
+import inspect
+import threading
 from dataclasses import dataclass
+from operator import attrgetter, methodcaller
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
 
+Column = Sequence[float]
+Metrics = Tuple[List[float], List[float], List[Optional[float]]]
 
-@dataclass
+# шаблон сообщения, общий для `InfoMessage` и массового вывода
+MESSAGE = ('Тип тренировки: %s; '
+           'Длительность: %.3f ч.; '
+           'Дистанция: %.3f км; '
+           'Ср. скорость: %.3f км/ч; '
+           'Потрачено ккал: %.3f.')
+
+
+@dataclass(slots=True)
 class InfoMessage:
     """Информационное сообщение о тренировке."""
     training_type: str
@@ -11,15 +25,106 @@ class InfoMessage:
     calories: float
 
     def get_message(self) -> str:
-        return (f'Тип тренировки: {self.training_type}; '
-                f'Длительность: {self.duration:.3f} ч.; '
-                f'Дистанция: {self.distance:.3f} км; '
-                f'Ср. скорость: {self.speed:.3f} км/ч; '
-                f'Потрачено ккал: {self.calories:.3f}.')
+        return MESSAGE % (self.training_type, self.duration,
+                          self.distance, self.speed, self.calories)
+
+
+def _lazy_field(slot: str, compute: Callable[['Training'], float],
+                doc: str) -> property:
+    """Поле, которое берётся у тренировки при первом чтении."""
+    def getter(self: 'LazyInfoMessage') -> float:
+        value = getattr(self, slot)
+        if value is None:
+            value = compute(self._training)
+            setattr(self, slot, value)
+        return value
+
+    def setter(self: 'LazyInfoMessage', value: float) -> None:
+        setattr(self, slot, value)
+    return property(getter, setter, doc=doc)
+
+
+class LazyInfoMessage:
+    """Информационное сообщение, считающее показатели по требованию.
+
+    Поля и текст сообщения те же, что у `InfoMessage`, но длительность,
+    дистанция, скорость и калории берутся у тренировки при первом
+    обращении к ним, а строка собирается только при вызове `get_message`.
+    Поэтому тренировку нельзя менять после того, как прочитано первое
+    поле: иначе поля окажутся посчитанными по разным данным. Копирование
+    параметров при создании стоило бы столько же, сколько готовое
+    `InfoMessage`.
+
+    `dataclasses.fields`, `asdict` и `astuple` работают так же, как для
+    `InfoMessage`; `dataclasses.replace` не поддерживается, вместо него
+    есть `materialize`.
+    """
+    __slots__ = ('training_type', '_training',
+                 '_duration', '_distance', '_speed', '_calories')
+    __dataclass_fields__ = InfoMessage.__dataclass_fields__
+
+    def __init__(self, training: 'Training') -> None:
+        self.training_type = training.__class__.__name__
+        self._training = training
+        self._duration = self._distance = self._speed = self._calories = None
+
+    duration = _lazy_field('_duration', attrgetter('duration'),
+                           'Длительность в часах.')
+    distance = _lazy_field('_distance', methodcaller('get_distance'),
+                           'Дистанция в км.')
+    speed = _lazy_field('_speed', methodcaller('get_mean_speed'),
+                        'Средняя скорость.')
+    calories = _lazy_field('_calories', methodcaller('get_spent_calories'),
+                           'Потраченные калории.')
+
+    get_message = InfoMessage.get_message
+
+    def materialize(self) -> InfoMessage:
+        """Посчитать все поля и вернуть обычное `InfoMessage`."""
+        return InfoMessage(self.training_type, self.duration,
+                           self.distance, self.speed, self.calories)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (InfoMessage, LazyInfoMessage)):
+            return self.materialize() == InfoMessage(
+                other.training_type, other.duration,
+                other.distance, other.speed, other.calories)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'Lazy{self.materialize()!r}'
+
+
+def _input_property(name: str) -> property:
+    """Параметр тренировки, запись которого сбрасывает запомненную скорость.
+
+    Значение хранится в атрибуте ``_<name>``: конструкторы пишут туда
+    напрямую, без вызова сеттера.
+    """
+    slot = '_' + name
+
+    def setter(self: 'Training', value: float) -> None:
+        setattr(self, slot, value)
+        self.reset_metrics()
+    return property(attrgetter(slot), setter)
+
+
+def _constructor_fields(training_class: type) -> Tuple[str, ...]:
+    """Имена параметров конструктора класса по порядку."""
+    return tuple(inspect.signature(training_class).parameters)
 
 
 class Training:
     """Базовый класс тренировки."""
+    # __dict__ оставлен, чтобы экземплярам можно было подменять атрибуты;
+    # сам словарь создаётся только при первой такой подмене.
+    __slots__ = ('_action', '_duration', '_weight', '_speed', '__dict__')
+    # параметры, от которых зависят рассчитанные показатели; у наследников
+    # берутся из сигнатуры конструктора и получают такие же свойства
+    INPUTS: Tuple[str, ...] = ('action', 'duration', 'weight')
+    action = _input_property('action')
+    duration = _input_property('duration')
+    weight = _input_property('weight')
     M_IN_KM: int = 1000
     LEN_STEP: float = 0.65
     HOUR_IN_MIN: int = 60  # коэфициенты для подсчета калорий
@@ -29,18 +134,33 @@ class Training:
                  duration: float,  # часы
                  weight: float,  # килограммы
                  ) -> None:
-        self.action = action
-        self.duration = duration
-        self.weight = weight
+        self._action = action
+        self._duration = duration
+        self._weight = weight
+        self._speed = None  # запомненная средняя скорость
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if 'INPUTS' not in vars(cls):
+            cls.INPUTS = _constructor_fields(cls)
+        for name in cls.INPUTS:
+            if not isinstance(getattr(cls, name, None), property):
+                setattr(cls, name, _input_property(name))
+
+    def reset_metrics(self) -> None:
+        """Сбросить запомненную среднюю скорость."""
+        self._speed = None
 
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
-        distance = self.action * self.LEN_STEP / self.M_IN_KM
+        distance = self._action * self.LEN_STEP / self.M_IN_KM
         return distance
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        speed = self.get_distance() / self.duration
+        speed = self._speed
+        if speed is None:
+            speed = self._speed = self.get_distance() / self._duration
         return speed
 
     def get_spent_calories(self) -> float:
@@ -50,15 +170,32 @@ class Training:
     def show_training_info(self) -> InfoMessage:
         """Вернуть информационное сообщение о выполненной тренировке."""
         infomes = InfoMessage(self.__class__.__name__,
-                              self.duration,
+                              self._duration,
                               self.get_distance(),
                               self.get_mean_speed(),
                               self.get_spent_calories())
         return infomes
 
+    def show_lazy_info(self) -> LazyInfoMessage:
+        """Вернуть сообщение, считающее показатели при обращении к ним."""
+        return LazyInfoMessage(self)
+
+    @classmethod
+    def batch_metrics(cls,
+                      action: Column,
+                      duration: Column,
+                      weight: Column,
+                      ) -> Metrics:
+        """Посчитать дистанцию, скорость и калории по колонкам данных."""
+        step, m_in_km = cls.LEN_STEP, cls.M_IN_KM
+        distance = [a * step / m_in_km for a in action]
+        speed = [d / t for d, t in zip(distance, duration)]
+        return distance, speed, [None] * len(distance)
+
 
 class Running(Training):
     """Тренировка: бег."""
+    __slots__ = ()
     COEFF_CALORIE_1: int = 18  # коэфициенты для подсчета калорий
     COEFF_CALORIE_2: int = 20  # коэфициенты для подсчета калорий
 
@@ -66,14 +203,29 @@ class Running(Training):
         """Получить количество затраченных калорий."""
         calories = (         # у нас в задании в примере COEFF_CALORIE
             (self.COEFF_CALORIE_1 * self.get_mean_speed()
-             - self.COEFF_CALORIE_2) * self.weight
-            / self.M_IN_KM * self.duration * self.HOUR_IN_MIN
+             - self.COEFF_CALORIE_2) * self._weight
+            / self.M_IN_KM * self._duration * self.HOUR_IN_MIN
         )
         return calories
 
+    @classmethod
+    def batch_metrics(cls,
+                      action: Column,
+                      duration: Column,
+                      weight: Column,
+                      ) -> Metrics:
+        """Посчитать дистанцию, скорость и калории по колонкам данных."""
+        distance, speed, _ = super().batch_metrics(action, duration, weight)
+        coeff_1, coeff_2 = cls.COEFF_CALORIE_1, cls.COEFF_CALORIE_2
+        m_in_km, hour = cls.M_IN_KM, cls.HOUR_IN_MIN
+        calories = [(coeff_1 * s - coeff_2) * w / m_in_km * t * hour
+                    for s, w, t in zip(speed, weight, duration)]
+        return distance, speed, calories
+
 
 class SportsWalking(Training):
     """Тренировка: спортивная ходьба."""
+    __slots__ = ('_height',)
     COEFF_CALORIE_3: float = 0.035  # коэфициенты для подсчета калорий
     COEFF_CALORIE_4: float = 0.029  # коэфициенты для подсчета калорий
 
@@ -86,20 +238,36 @@ class SportsWalking(Training):
         # наследуем функциональность конструктора из класса-родителя
         super().__init__(action, duration, weight)
         # добавляем новую функциональность: свойство height
-        self.height = height
+        self._height = height
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
         calorie = (
-            (self.COEFF_CALORIE_3 * self.weight
-             + self.get_mean_speed()**2 // self.height * self.COEFF_CALORIE_4
-             * self.weight) * self.duration * self.HOUR_IN_MIN
+            (self.COEFF_CALORIE_3 * self._weight
+             + self.get_mean_speed()**2 // self._height * self.COEFF_CALORIE_4
+             * self._weight) * self._duration * self.HOUR_IN_MIN
         )
         return calorie
 
+    @classmethod
+    def batch_metrics(cls,
+                      action: Column,
+                      duration: Column,
+                      weight: Column,
+                      height: Column,
+                      ) -> Metrics:
+        """Посчитать дистанцию, скорость и калории по колонкам данных."""
+        distance, speed, _ = super().batch_metrics(action, duration, weight)
+        coeff_3, coeff_4 = cls.COEFF_CALORIE_3, cls.COEFF_CALORIE_4
+        hour = cls.HOUR_IN_MIN
+        calories = [(coeff_3 * w + s**2 // h * coeff_4 * w) * t * hour
+                    for s, w, h, t in zip(speed, weight, height, duration)]
+        return distance, speed, calories
+
 
 class Swimming(Training):
     """Тренировка: плавание."""
+    __slots__ = ('_length_pool', '_count_pool')
     LEN_STEP: float = 1.38  # переопределяем для класса плавание
     CALORIE_RATIO: float = 1.1
     CALORIE_RATIO_2: int = 2
@@ -114,35 +282,141 @@ class Swimming(Training):
         # наследуем функциональность конструктора из класса-родителя
         super().__init__(action, duration, weight)
         # добавляем новую функциональность: свойство length_pool, count_pool
-        self.length_pool = length_pool
-        self.count_pool = count_pool
+        self._length_pool = length_pool
+        self._count_pool = count_pool
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        return (
-            self.length_pool * self.count_pool / self.M_IN_KM / self.duration
-        )
+        speed = self._speed
+        if speed is None:
+            speed = self._speed = (
+                self._length_pool * self._count_pool / self.M_IN_KM
+                / self._duration
+            )
+        return speed
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
         calori = (
             (self.get_mean_speed() + self.CALORIE_RATIO) * self.CALORIE_RATIO_2
-            * self.weight
+            * self._weight
         )
         return calori
 
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
-        distance = self.action * self.LEN_STEP / self.M_IN_KM
+        distance = self._action * self.LEN_STEP / self.M_IN_KM
         return distance
 
+    @classmethod
+    def batch_metrics(cls,
+                      action: Column,
+                      duration: Column,
+                      weight: Column,
+                      length_pool: Column,
+                      count_pool: Column,
+                      ) -> Metrics:
+        """Посчитать дистанцию, скорость и калории по колонкам данных."""
+        step, m_in_km = cls.LEN_STEP, cls.M_IN_KM
+        ratio_1, ratio_2 = cls.CALORIE_RATIO, cls.CALORIE_RATIO_2
+        distance = [a * step / m_in_km for a in action]
+        speed = [p * c / m_in_km / t
+                 for p, c, t in zip(length_pool, count_pool, duration)]
+        calories = [(s + ratio_1) * ratio_2 * w
+                    for s, w in zip(speed, weight)]
+        return distance, speed, calories
+
+
+@dataclass(frozen=True)
+class WorkoutType:
+    """Зарегистрированный тип тренировки."""
+    code: str
+    training_class: Type[Training]
+    fields: Tuple[str, ...]  # имена параметров пакета по порядку
+    construct: Callable[[Sequence[float]], Training]
+    kernel: Callable[..., Metrics]  # пакетный расчёт по колонкам
+
+    @property
+    def arity(self) -> int:
+        """Число параметров в пакете."""
+        return len(self.fields)
+
+
+TRAINING_TYPES: Dict[str, WorkoutType] = {}
+_CONSTRUCTORS: Dict[str, Callable[[Sequence[float]], Training]] = {}
+# изменения реестра идут под блокировкой; чтение обходится без неё, так как
+# каждое обращение к словарю атомарно
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _make_constructor(training_class: Type[Training],
+                      arity: int) -> Callable[[Sequence[float]], Training]:
+    """Собрать конструктор, заранее проверяющий число параметров."""
+    def construct(data: Sequence[float]) -> Training:
+        if len(data) != arity:
+            raise ValueError(f'{training_class.__name__}: ожидается '
+                             f'{arity} параметров, получено {len(data)}')
+        return training_class(*data)
+    return construct
+
+
+def _object_kernel(training_class: Type[Training]) -> Callable[..., Metrics]:
+    """Пакетный расчёт через объекты для класса без своего batch_metrics."""
+    def kernel(*columns: Column) -> Metrics:
+        trainings = [training_class(*row) for row in zip(*columns)]
+        return ([training.get_distance() for training in trainings],
+                [training.get_mean_speed() for training in trainings],
+                [training.get_spent_calories() for training in trainings])
+    return kernel
+
+
+def _default_kernel(training_class: Type[Training]) -> Callable[..., Metrics]:
+    if 'batch_metrics' in vars(training_class):
+        return training_class.batch_metrics
+    return _object_kernel(training_class)
+
+
+def register_training(code: str,
+                      training_class: Type[Training],
+                      kernel: Optional[Callable[..., Metrics]] = None,
+                      ) -> WorkoutType:
+    """Зарегистрировать тип тренировки под кодом пакета.
+
+    Без kernel для пакетного расчёта берётся `batch_metrics`, если класс
+    определяет его сам; иначе колонки считаются через объекты, чтобы
+    унаследованное ядро не разошлось с переопределёнными методами.
+    """
+    fields = _constructor_fields(training_class)
+    workout_type = WorkoutType(code, training_class, fields,
+                               _make_constructor(training_class, len(fields)),
+                               kernel or _default_kernel(training_class))
+    with _REGISTRY_LOCK:
+        if code in TRAINING_TYPES:
+            raise ValueError(f'тип тренировки {code} уже зарегистрирован')
+        TRAINING_TYPES[code] = workout_type
+        _CONSTRUCTORS[code] = workout_type.construct
+    return workout_type
+
+
+def unregister_training(code: str) -> None:
+    """Убрать тип тренировки из реестра."""
+    with _REGISTRY_LOCK:
+        del _CONSTRUCTORS[code]
+        del TRAINING_TYPES[code]
+
+
+register_training('SWM', Swimming)
+register_training('RUN', Running)
+register_training('WLK', SportsWalking)
+
 
 def read_package(workout_type: str, data: list) -> Training:
     """Прочитать данные полученные от датчиков."""
-    training_types = {'SWM': Swimming, 'RUN': Running, 'WLK': SportsWalking}
-    if training_types.get(workout_type, None) is None:
-        raise ValueError('ошибка')
-    return training_types[workout_type](*data)
+    try:
+        construct = _CONSTRUCTORS[workout_type]
+    except KeyError:
+        raise ValueError('ошибка') from None
+    return construct(data)
 
 
 def main(training: Training) -> None:
@@ -152,12 +426,8 @@ def main(training: Training) -> None:
 
 
 if __name__ == '__main__':
-    packages = [
-        ('SWM', [720, 1, 80, 25, 40]),
-        ('RUN', [15000, 1, 75]),
-        ('WLK', [9000, 1, 75, 180]),
-    ]
-
-    for workout_type, data in packages:
-        training = read_package(workout_type, data)
-        main(training)
+    import sys
+
+    import stream
+
+    sys.exit(stream.cli())
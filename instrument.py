@@ -0,0 +1,89 @@
+"""Необязательные замеры времени по стадиям обработки пакетов.
+
+Пока замеры не включены, конвейер проверяет `active()` один раз на запуск
+и работает без единого вызова таймера. После `enable()` для каждой стадии
+(parse, construct, compute, format, output) и каждого типа тренировки
+копятся число вызовов, суммарное время и гистограмма по степеням двойки
+наносекунд.
+"""
+import atexit
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+STAGES = ('parse', 'construct', 'compute', 'format', 'output')
+BUCKETS = 64
+
+
+class Recorder:
+    """Накопитель замеров времени по стадиям и типам тренировок."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], List] = {}
+
+    def record(self, stage: str, workout_type: str, nanoseconds: int) -> None:
+        """Учесть один вызов стадии длительностью nanoseconds."""
+        key = (stage, workout_type)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [0, 0, [0] * BUCKETS]
+            stats[0] += 1
+            stats[1] += nanoseconds
+            stats[2][min(nanoseconds.bit_length(), BUCKETS - 1)] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        """Вернуть копию накопленных замеров.
+
+        Ключ гистограммы — верхняя граница корзины в наносекундах.
+        """
+        with self._lock:
+            items = [(key, count, total, list(histogram))
+                     for key, (count, total, histogram)
+                     in self._stats.items()]
+        snapshot: Dict[str, Dict[str, dict]] = {}
+        for (stage, workout_type), count, total, histogram in items:
+            snapshot.setdefault(stage, {})[workout_type] = {
+                'count': count,
+                'total_seconds': total / 1e9,
+                'mean_us': total / count / 1e3,
+                'histogram_ns': {str(2 ** bucket): hits
+                                 for bucket, hits in enumerate(histogram)
+                                 if hits},
+            }
+        return snapshot
+
+    def reset(self) -> None:
+        """Сбросить накопленные замеры."""
+        with self._lock:
+            self._stats.clear()
+
+    def dump(self, path: str) -> None:
+        """Сохранить снимок замеров в JSON."""
+        with open(path, 'w', encoding='utf-8') as sink:
+            json.dump(self.snapshot(), sink, indent=2)
+
+
+_recorder: Optional[Recorder] = None
+
+
+def active() -> Optional[Recorder]:
+    """Вернуть включённый накопитель или None."""
+    return _recorder
+
+
+def enable(dump_path: Optional[str] = None) -> Recorder:
+    """Включить замеры; с dump_path снимок сохранится при выходе."""
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder()
+    if dump_path is not None:
+        atexit.register(_recorder.dump, dump_path)
+    return _recorder
+
+
+def disable() -> None:
+    """Выключить замеры."""
+    global _recorder
+    _recorder = None
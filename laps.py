@@ -0,0 +1,77 @@
+"""Потоковый расчёт тренировки по интервальным замерам датчика.
+
+Датчик присылает накопленные значения: число шагов или гребков и, для
+плавания, число проплытых бассейнов к моменту времени в часах от начала.
+Каждый замер обрабатывается за O(1); по кругам и за всю тренировку
+показатели считаются теми же классами, что и для сводных пакетов, поэтому
+используются их `LEN_STEP`, `M_IN_KM` и коэффициенты калорий.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from homework import TRAINING_TYPES, InfoMessage, WorkoutType
+
+
+class SessionStream:
+    """Тренировка, собираемая по мере поступления замеров."""
+
+    def __init__(self,
+                 workout_type: str,
+                 weight: float,
+                 height: Optional[float] = None,
+                 length_pool: Optional[float] = None,
+                 start: float = 0.0,
+                 ) -> None:
+        registered = TRAINING_TYPES.get(workout_type)
+        if registered is None:
+            raise ValueError('ошибка')
+        self.registered: WorkoutType = registered
+        self.static: Dict[str, Optional[float]] = {
+            'weight': weight, 'height': height, 'length_pool': length_pool}
+        missing = [name for name in registered.fields
+                   if name in self.static and self.static[name] is None]
+        if missing:
+            raise ValueError(f'не заданы параметры: {", ".join(missing)}')
+        self.start = start
+        # накопленные значения: время, действия, бассейны
+        self.last: Tuple[float, float, float] = (start, 0, 0)
+        self.lap_start: Tuple[float, float, float] = self.last
+        self.laps: List[InfoMessage] = []
+
+    def add(self, timestamp: float, action: float,
+            count_pool: float = 0, end_lap: bool = False,
+            ) -> Optional[InfoMessage]:
+        """Учесть накопленный замер; с end_lap закрыть круг на нём."""
+        sample = (timestamp, action, count_pool)
+        if any(new < old for new, old in zip(sample, self.last)):
+            raise ValueError('замеры должны идти по возрастанию')
+        self.last = sample
+        if end_lap:
+            return self.lap()
+        return None
+
+    def _info(self, since: Tuple[float, float, float]) -> InfoMessage:
+        timestamp, action, count_pool = self.last
+        values = dict(self.static,
+                      action=action - since[1],
+                      duration=timestamp - since[0],
+                      count_pool=count_pool - since[2])
+        if values['duration'] <= 0:
+            raise ValueError('за интервал не прошло времени')
+        training = self.registered.construct(
+            [values[name] for name in self.registered.fields])
+        return training.show_training_info()
+
+    def current(self) -> InfoMessage:
+        """Показатели текущего незакрытого круга."""
+        return self._info(self.lap_start)
+
+    def lap(self) -> InfoMessage:
+        """Закрыть текущий круг и вернуть его показатели."""
+        info = self.current()
+        self.laps.append(info)
+        self.lap_start = self.last
+        return info
+
+    def total(self) -> InfoMessage:
+        """Показатели всей тренировки на момент последнего замера."""
+        return self._info((self.start, 0, 0))
@@ -0,0 +1,168 @@
+"""Таблицы лидеров по тренировкам, обновляемые на лету."""
+import heapq
+from itertools import count
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from homework import Training, read_package
+
+# показатель таблицы и метод тренировки, который его считает
+METRICS = {
+    'calories': 'get_spent_calories',
+    'distance': 'get_distance',
+    'speed': 'get_mean_speed',
+}
+
+
+# поля записи: значение, порядок поступления (у ранних больше),
+# сессия (None у удалённых) и признак нахождения в первых k
+_VALUE, _ORDER, _SESSION, _IN_TOP = range(4)
+
+
+class Leaderboard:
+    """Лучшие k значений среди всех неудалённых сессий.
+
+    Значения всех сессий хранятся в двух кучах: в min-куче — текущие
+    первые k, в max-куче — остальные. Добавление и удаление стоят
+    O(log n) от числа сессий. Место отозванной сессии из первых k занимает
+    лучшая из остальных. Удалённые записи помечаются и уходят из куч, когда
+    оказываются на вершине или когда их становится больше живых.
+    """
+
+    def __init__(self, k: int) -> None:
+        if k < 1:
+            raise ValueError('размер таблицы должен быть положительным')
+        self.k = k
+        self._top: List[list] = []
+        self._rest: List[Tuple[float, int, list]] = []
+        self._live: Dict[Hashable, list] = {}
+        self._in_top = 0
+        self._order = count()
+
+    def __len__(self) -> int:
+        return self._in_top
+
+    def __contains__(self, session_id: Hashable) -> bool:
+        return session_id in self._live
+
+    def _lowest_top(self) -> list:
+        top = self._top
+        while top[0][_SESSION] is None:
+            heapq.heappop(top)
+        return top[0]
+
+    def _best_rest(self) -> Optional[list]:
+        rest = self._rest
+        while rest and rest[0][2][_SESSION] is None:
+            heapq.heappop(rest)
+        return rest[0][2] if rest else None
+
+    def _push_rest(self, entry: list) -> None:
+        entry[_IN_TOP] = False
+        heapq.heappush(self._rest, (-entry[_VALUE], -entry[_ORDER], entry))
+
+    def _compact(self) -> None:
+        if len(self._top) > 2 * self._in_top + 16:
+            self._top = [entry for entry in self._top
+                         if entry[_SESSION] is not None]
+            heapq.heapify(self._top)
+        if len(self._rest) > 2 * (len(self._live) - self._in_top) + 16:
+            self._rest = [item for item in self._rest
+                          if item[2][_SESSION] is not None]
+            heapq.heapify(self._rest)
+
+    def add(self, session_id: Hashable, value: float) -> bool:
+        """Учесть значение сессии; вернуть, попала ли она в первые k."""
+        if session_id in self._live:
+            self.remove(session_id)
+        # при равных значениях выше стоит более ранняя сессия
+        entry = [value, -next(self._order), session_id, True]
+        self._live[session_id] = entry
+        if self._in_top < self.k:
+            heapq.heappush(self._top, entry)
+            self._in_top += 1
+            return True
+        lowest = self._lowest_top()
+        if entry < lowest:
+            self._push_rest(entry)
+            return False
+        heapq.heapreplace(self._top, entry)
+        self._push_rest(lowest)
+        return True
+
+    def remove(self, session_id: Hashable) -> bool:
+        """Отозвать сессию; вернуть, была ли она учтена."""
+        entry = self._live.pop(session_id, None)
+        if entry is None:
+            return False
+        entry[_SESSION] = None
+        if entry[_IN_TOP]:
+            self._in_top -= 1
+            best = self._best_rest()
+            if best is not None:
+                heapq.heappop(self._rest)
+                best[_IN_TOP] = True
+                heapq.heappush(self._top, best)
+                self._in_top += 1
+        self._compact()
+        return True
+
+    def top(self) -> List[Tuple[Hashable, float]]:
+        """Первые k сессий от лучшей к худшей."""
+        best = sorted((entry for entry in self._top
+                       if entry[_SESSION] is not None), reverse=True)
+        return [(entry[_SESSION], entry[_VALUE]) for entry in best]
+
+
+class LeaderboardIndex:
+    """Общие таблицы и таблицы по типам тренировок для нескольких метрик."""
+
+    def __init__(self, k: int = 10,
+                 metrics: Sequence[str] = tuple(METRICS)) -> None:
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f'неизвестные показатели: {sorted(unknown)}')
+        self.k = k
+        self.metrics = tuple(metrics)
+        self.boards: Dict[Tuple[str, Optional[str]], Leaderboard] = {}
+
+    def board(self, metric: str,
+              training_type: Optional[str] = None) -> Leaderboard:
+        """Таблица по показателю; без training_type — общая."""
+        key = (metric, training_type)
+        board = self.boards.get(key)
+        if board is None:
+            board = self.boards[key] = Leaderboard(self.k)
+        return board
+
+    def add(self, session_id: Hashable, workout_type: str,
+            data: Sequence[float]) -> Training:
+        """Посчитать пакет и учесть его во всех таблицах."""
+        training = read_package(workout_type, data)
+        self.add_training(session_id, training)
+        return training
+
+    def add_training(self, session_id: Hashable, training: Training) -> None:
+        """Учесть уже созданную тренировку во всех таблицах.
+
+        Прежнее значение сессии убирается из всех таблиц, даже если тип
+        тренировки у неё сменился.
+        """
+        self.remove(session_id)
+        training_type = training.__class__.__name__
+        for metric in self.metrics:
+            value = getattr(training, METRICS[metric])()
+            self.board(metric).add(session_id, value)
+            self.board(metric, training_type).add(session_id, value)
+
+    def remove(self, session_id: Hashable) -> bool:
+        """Отозвать сессию из всех таблиц."""
+        removed = False
+        for board in self.boards.values():
+            removed = board.remove(session_id) or removed
+        return removed
+
+    def top(self, metric: str, training_type: Optional[str] = None,
+            ) -> List[Tuple[Hashable, float]]:
+        """Лучшие сессии по показателю, общие или для одного типа."""
+        board = self.boards.get((metric, training_type))
+        return board.top() if board is not None else []
@@ -0,0 +1,164 @@
+"""Двоичный формат пакетов с чтением через отображение файла в память.
+
+Файл состоит из заголовка, таблицы разделов и самих разделов. Раздел
+хранит пакеты одного типа тренировки по колонкам: для каждого параметра
+(action, duration, weight и параметры типа) подряд идут n чисел float64
+little-endian, за ними n байт кода типа из `sessions.SESSION_TYPES`, и
+раздел дополняется нулями до границы 8 байт.
+
+`PackFile` отдаёт колонки раздела как непрерывные `memoryview` поверх
+страниц файла, без копирования и без создания объектов на каждую запись.
+Эти же представления можно передать в `numpy.frombuffer` или любую
+функцию, которой нужен непрерывный буфер.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, Iterable, List, Tuple
+
+from batch import BatchResult, compute_batch
+from sessions import SESSION_TYPES
+
+MAGIC = b'HWPK'
+VERSION = 2
+HEADER = struct.Struct('<4sHHQ')
+SECTION = struct.Struct('<4s4xQQ')
+DOUBLE = 8
+_SWAP = sys.byteorder != 'little'
+
+_CODE_INDEX = {code: index for index, (code, _) in enumerate(SESSION_TYPES)}
+_ARITY = dict(SESSION_TYPES)
+
+
+def _padding(size: int) -> int:
+    return -size % DOUBLE
+
+
+def _section(workout_type: str, columns: List[array]) -> bytes:
+    """Собрать раздел: колонки параметров, колонка кодов и выравнивание."""
+    parts = []
+    for column in columns:
+        if _SWAP:
+            column.byteswap()
+        parts.append(column.tobytes())
+    count = len(columns[0])
+    parts.append(bytes([_CODE_INDEX[workout_type]]) * count)
+    parts.append(bytes(_padding(count)))
+    return b''.join(parts)
+
+
+def write_packets(sink: BinaryIO, packages: Iterable[tuple]) -> int:
+    """Записать пакеты в двоичном формате и вернуть их число."""
+    sections: Dict[str, List[array]] = {}
+    for workout_type, data in packages:
+        if workout_type not in _CODE_INDEX:
+            raise ValueError('ошибка')
+        if len(data) != _ARITY[workout_type]:
+            raise ValueError(f'неверное число параметров для {workout_type}')
+        columns = sections.get(workout_type)
+        if columns is None:
+            columns = sections[workout_type] = [
+                array('d') for _ in range(_ARITY[workout_type])]
+        for column, value in zip(columns, data):
+            column.append(value)
+    counts = {workout_type: len(columns[0])
+              for workout_type, columns in sections.items()}
+    total = sum(counts.values())
+    sink.write(HEADER.pack(MAGIC, VERSION, len(sections), total))
+    offset = HEADER.size + SECTION.size * len(sections)
+    for workout_type, count in counts.items():
+        sink.write(SECTION.pack(workout_type.encode(), offset, count))
+        size = count * (_ARITY[workout_type] * DOUBLE + 1)
+        offset += size + _padding(size)
+    for workout_type, columns in sections.items():
+        sink.write(_section(workout_type, columns))
+    return total
+
+
+class PackFile:
+    """Файл пакетов, отображённый в память только для чтения."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as source:
+            self._map = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        self.sections: Dict[str, Tuple[int, int]] = {}
+        try:
+            self._read_table(path)
+        except ValueError:
+            self._map.close()
+            raise
+
+    def _read_table(self, path: str) -> None:
+        """Прочитать таблицу разделов и проверить, что разделы в файле."""
+        size = len(self._map)
+        if size < HEADER.size:
+            raise ValueError(f'{path}: файл пакетов оборван')
+        magic, version, count, self.total = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path}: не файл пакетов версии {VERSION}')
+        if HEADER.size + count * SECTION.size > size:
+            raise ValueError(f'{path}: файл пакетов оборван')
+        for number in range(count):
+            code, offset, length = SECTION.unpack_from(
+                self._map, HEADER.size + number * SECTION.size)
+            workout_type = code.rstrip(b'\0').decode()
+            if workout_type not in _ARITY:
+                raise ValueError(f'{path}: неизвестный тип {workout_type}')
+            if offset + length * (_ARITY[workout_type] * DOUBLE + 1) > size:
+                raise ValueError(f'{path}: файл пакетов оборван')
+            self.sections[workout_type] = (offset, length)
+        if sum(length for _, length in self.sections.values()) != self.total:
+            raise ValueError(f'{path}: число пакетов не сходится с разделами')
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _view(self, start: int, size: int) -> memoryview:
+        view = memoryview(self._map)[start:start + size]
+        self._views.append(view)
+        return view
+
+    def codes(self, workout_type: str) -> memoryview:
+        """Колонка кодов типа для раздела."""
+        offset, length = self.sections[workout_type]
+        return self._view(
+            offset + _ARITY[workout_type] * DOUBLE * length, length)
+
+    def columns(self, workout_type: str) -> List[memoryview]:
+        """Колонки параметров раздела в порядке аргументов конструктора.
+
+        Колонки действительны до закрытия файла.
+        """
+        offset, length = self.sections[workout_type]
+        doubles = self._view(
+            offset, _ARITY[workout_type] * DOUBLE * length).cast('d')
+        columns = [doubles[field * length:(field + 1) * length]
+                   for field in range(_ARITY[workout_type])]
+        self._views.append(doubles)
+        self._views.extend(columns)
+        return columns
+
+    def compute(self) -> Dict[str, BatchResult]:
+        """Посчитать показатели всех разделов прямо по страницам файла."""
+        results = {}
+        for workout_type in self.sections:
+            result = compute_batch(workout_type, self.columns(workout_type))
+            # длительность копируется, чтобы результат пережил закрытие файла
+            result.duration = result.duration.tolist()
+            results[workout_type] = result
+        return results
+
+    def close(self) -> None:
+        """Освободить выданные колонки и закрыть отображение файла."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._map.close()
+
+    def __enter__(self) -> 'PackFile':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,76 @@
+"""Параллельная обработка больших файлов с пакетами в пуле процессов.
+
+Файл режется на пачки строк, пачки считаются в отдельных процессах,
+а сообщения пишутся в выходной поток в исходном порядке пакетов.
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import IO, Iterable, List, Optional, Sequence, Tuple
+
+from stream import (detect_format, iter_chunks, iter_packets, iter_trainings,
+                    open_source)
+
+
+def process_lines(lines: List[str], fmt: str) -> Tuple[int, str]:
+    """Посчитать пачку строк и вернуть число пакетов и текст сообщений."""
+    messages = [training.show_training_info().get_message()
+                for training in iter_trainings(iter_packets(lines, fmt))]
+    if not messages:
+        return 0, ''
+    return len(messages), '\n'.join(messages) + '\n'
+
+
+def process(lines: Iterable[str],
+            out: IO[str],
+            fmt: str = 'jsonl',
+            executor: Optional[Executor] = None,
+            workers: Optional[int] = None,
+            chunk_size: int = 10000) -> int:
+    """Обработать строки в пуле процессов, сохраняя порядок вывода.
+
+    Одновременно в работе держится не больше двух пачек на процесс,
+    поэтому расход памяти не зависит от размера входа.
+    """
+    if executor is None:
+        with ProcessPoolExecutor(workers) as pool:
+            return process(lines, out, fmt, pool, workers, chunk_size)
+    window = 2 * (workers or os.cpu_count() or 1)
+    pending = deque()
+    count = 0
+    for chunk in iter_chunks(lines, chunk_size):
+        pending.append(executor.submit(process_lines, chunk, fmt))
+        if len(pending) >= window:
+            done, text = pending.popleft().result()
+            count += done
+            out.write(text)
+    while pending:
+        done, text = pending.popleft().result()
+        count += done
+        out.write(text)
+    return count
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Параллельный расчёт тренировок по файлу с пакетами.')
+    parser.add_argument('path', help='файл с пакетами, - для stdin')
+    parser.add_argument('--format', choices=('jsonl', 'csv'),
+                        help='формат входа, по умолчанию по расширению')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='число процессов, по умолчанию по числу ядер')
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='сколько строк отдавать процессу за раз')
+    args = parser.parse_args(argv)
+    fmt = args.format or detect_format(args.path)
+    with open_source(args.path) as source:
+        process(source, sys.stdout, fmt,
+                workers=args.workers, chunk_size=args.chunk_size)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
@@ -0,0 +1,66 @@
+"""Массовый вывод сообщений о тренировках крупными буферизованными записями."""
+import sys
+from itertools import islice, repeat
+from operator import attrgetter
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Union
+
+from batch import BatchResult
+from homework import MESSAGE, InfoMessage
+
+DEFAULT_BATCH_SIZE = 8192
+
+_fields = attrgetter('training_type', 'duration', 'distance',
+                     'speed', 'calories')
+
+
+def format_messages(infos: Iterable[InfoMessage]) -> Iterator[str]:
+    """Отформатировать сообщения так же, как `InfoMessage.get_message`."""
+    return map(MESSAGE.__mod__, map(_fields, infos))
+
+
+def format_columns(training_type: Union[str, Sequence[str]],
+                   duration: Sequence[float],
+                   distance: Sequence[float],
+                   speed: Sequence[float],
+                   calories: Sequence[float]) -> Iterator[str]:
+    """Отформатировать сообщения по колонкам показателей.
+
+    Вместо колонки типов можно передать одно название для всех строк.
+    """
+    if isinstance(training_type, str):
+        training_type = repeat(training_type)
+    return map(MESSAGE.__mod__,
+               zip(training_type, duration, distance, speed, calories))
+
+
+def write_lines(lines: Iterable[str],
+                sink: Optional[IO[str]] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Записать строки пачками, по одной записи на пачку."""
+    sink = sys.stdout if sink is None else sink
+    lines = iter(lines)
+    count = 0
+    while True:
+        chunk: List[str] = list(islice(lines, batch_size))
+        if not chunk:
+            return count
+        chunk.append('')
+        sink.write('\n'.join(chunk))
+        count += len(chunk) - 1
+
+
+def write_messages(infos: Iterable[InfoMessage],
+                   sink: Optional[IO[str]] = None,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Вывести сообщения о тренировках и вернуть их число."""
+    return write_lines(format_messages(infos), sink, batch_size)
+
+
+def write_batch(result: BatchResult,
+                sink: Optional[IO[str]] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Вывести сообщения по результату пакетного расчёта."""
+    return write_lines(
+        format_columns(result.training_type, result.duration,
+                       result.distance, result.speed, result.calories),
+        sink, batch_size)
@@ -0,0 +1,240 @@
+"""Асинхронный сервер приёма пакетов от датчиков.
+
+Пакеты приходят по TCP или Unix-сокету, по одному JSON на строку, в том же
+виде, что и в `stream`: ``["RUN", [15000, 1, 75]]``. На каждую строку
+сервер отвечает строкой JSON: ``{"message": ...}`` с текстом сообщения,
+словарём полей `InfoMessage` или ``{"error": ...}``. Бесконечные и
+неопределённые значения полей передаются как ``null``. На строку длиннее
+буфера чтения сервер отвечает ошибкой и закрывает соединение: границу
+следующего пакета в таком потоке уже не найти.
+
+Пакеты считаются обработчиками из общей ограниченной очереди. Когда очередь
+заполнена, соединения перестают читать сокет, и клиенты упираются в
+управление потоком TCP.
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from dataclasses import asdict
+from typing import List, Optional, Sequence
+
+from homework import read_package
+from stream import parse_json
+
+MODES = ('text', 'fields')
+
+
+def _encode(reply: dict) -> bytes:
+    return json.dumps(reply, ensure_ascii=False).encode() + b'\n'
+
+
+def _error(error: Exception) -> bytes:
+    return _encode({'error': f'{type(error).__name__}: {error}'})
+
+
+def _json_value(value: object) -> object:
+    """Значение поля для JSON: inf и NaN в JSON не входят."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def handle_packet(line: bytes, mode: str = 'text') -> bytes:
+    """Посчитать один пакет и вернуть строку ответа."""
+    try:
+        info = read_package(*parse_json(line)).show_training_info()
+    except Exception as error:
+        # любая ошибка пакета — ответ клиенту, а не падение обработчика
+        return _error(error)
+    if mode == 'text':
+        return _encode({'message': info.get_message()})
+    return _encode({name: _json_value(value)
+                    for name, value in asdict(info).items()})
+
+
+class TrainingServer:
+    """Сервер, считающий пакеты из общей ограниченной очереди."""
+
+    def __init__(self,
+                 mode: str = 'text',
+                 queue_size: int = 1024,
+                 workers: int = 4,
+                 ) -> None:
+        if mode not in MODES:
+            raise ValueError(f'неизвестный режим ответа: {mode}')
+        self.mode = mode
+        self.queue_size = queue_size
+        self.workers = workers
+        self.queue: Optional[asyncio.Queue] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def _worker(self) -> None:
+        while True:
+            line, future = await self.queue.get()
+            try:
+                reply = handle_packet(line, self.mode)
+            except Exception as error:
+                if not future.cancelled():
+                    future.set_exception(error)
+            else:
+                if not future.cancelled():
+                    future.set_result(reply)
+            finally:
+                self.queue.task_done()
+
+    async def handle(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Обслужить одно соединение: ответы идут в порядке запросов."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError as error:
+                    # строка не поместилась в буфер StreamReader
+                    writer.write(_error(error))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                future = loop.create_future()
+                await self.queue.put((line, future))
+                writer.write(await future)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _start_workers(self) -> None:
+        self.queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker())
+                       for _ in range(self.workers)]
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 0,
+                        **kwargs) -> asyncio.AbstractServer:
+        """Запустить сервер на TCP-сокете."""
+        self._start_workers()
+        self.server = await asyncio.start_server(
+            self.handle, host, port, **kwargs)
+        return self.server
+
+    async def start_unix(self, path: str,
+                         **kwargs) -> asyncio.AbstractServer:
+        """Запустить сервер на Unix-сокете."""
+        self._start_workers()
+        self.server = await asyncio.start_unix_server(
+            self.handle, path, **kwargs)
+        return self.server
+
+    async def close(self) -> None:
+        """Остановить приём соединений и обработчики очереди."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+async def _open(host: str, port: int, path: Optional[str]):
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _client(packets: Sequence[bytes], host: str, port: int,
+                  path: Optional[str], latencies: List[float]) -> None:
+    reader, writer = await _open(host, port, path)
+    try:
+        for packet in packets:
+            started = time.perf_counter()
+            writer.write(packet)
+            await writer.drain()
+            await reader.readline()
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def _percentile(ordered: Sequence[float], share: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+
+async def load(connections: int = 100,
+               packets: int = 100,
+               host: str = '127.0.0.1',
+               port: int = 8000,
+               path: Optional[str] = None) -> dict:
+    """Нагрузить сервер параллельными соединениями и вернуть статистику."""
+    samples = [
+        b'["SWM", [720, 1, 80, 25, 40]]\n',
+        b'["RUN", [15000, 1, 75]]\n',
+        b'["WLK", [9000, 1, 75, 180]]\n',
+    ]
+    batch = [samples[index % len(samples)] for index in range(packets)]
+    latencies: List[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(batch, host, port, path, latencies)
+                           for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'packets': len(latencies),
+        'seconds': elapsed,
+        'packets_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': _percentile(latencies, 0.5) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Запустить сервер и работать до остановки процесса."""
+    server = TrainingServer(args.mode, args.queue_size, args.workers)
+    if args.unix:
+        await server.start_unix(args.unix)
+    else:
+        await server.start_tcp(args.host, args.port)
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=('serve', 'load'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--unix', help='путь к Unix-сокету вместо TCP')
+    parser.add_argument('--mode', choices=MODES, default='text')
+    parser.add_argument('--queue-size', type=int, default=1024)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--packets', type=int, default=100,
+                        help='пакетов на одно соединение при нагрузке')
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    stats = asyncio.run(load(args.connections, args.packets,
+                             args.host, args.port, args.unix))
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
@@ -0,0 +1,63 @@
+"""Компактное хранение тренировок в типизированных массивах."""
+from array import array
+from typing import Iterator, Sequence
+
+from homework import InfoMessage, Training, read_package
+
+# Код тренировки и число параметров в пакете.
+SESSION_TYPES = (('RUN', 3), ('WLK', 4), ('SWM', 5))
+
+_CODE_INDEX = {code: index for index, (code, _) in enumerate(SESSION_TYPES)}
+_EXTRA_FIELDS = 2
+_EMPTY = float('nan')
+
+
+class SessionLog:
+    """Журнал тренировок, хранящий параметры колонками.
+
+    Вместо объекта на каждую тренировку хранится байт с кодом типа и пять
+    чисел двойной точности: около 41 байта на тренировку. Объекты
+    `Training` создаются заново только при обращении к записи.
+    """
+    __slots__ = ('codes', 'action', 'duration', 'weight', 'extra')
+
+    def __init__(self) -> None:
+        self.codes = array('B')
+        self.action = array('d')
+        self.duration = array('d')
+        self.weight = array('d')
+        self.extra = [array('d') for _ in range(_EXTRA_FIELDS)]
+
+    def append(self, workout_type: str, data: Sequence[float]) -> None:
+        """Добавить пакет тренировки в журнал."""
+        index = _CODE_INDEX.get(workout_type)
+        if index is None:
+            raise ValueError('ошибка')
+        if len(data) != SESSION_TYPES[index][1]:
+            raise ValueError(f'неверное число параметров для {workout_type}')
+        self.codes.append(index)
+        self.action.append(data[0])
+        self.duration.append(data[1])
+        self.weight.append(data[2])
+        for position, column in enumerate(self.extra, 3):
+            column.append(data[position] if position < len(data) else _EMPTY)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def package(self, index: int) -> tuple:
+        """Вернуть пакет `(workout_type, data)` по номеру записи."""
+        workout_type, arity = SESSION_TYPES[self.codes[index]]
+        data = [self.action[index], self.duration[index], self.weight[index]]
+        data.extend(column[index] for column in self.extra[:arity - 3])
+        return workout_type, data
+
+    def __getitem__(self, index: int) -> Training:
+        return read_package(*self.package(index))
+
+    def __iter__(self) -> Iterator[Training]:
+        return (self[index] for index in range(len(self)))
+
+    def infos(self) -> Iterator[InfoMessage]:
+        """Лениво построить сообщения по всем записям журнала."""
+        return (training.show_training_info() for training in self)
@@ -0,0 +1,204 @@
+"""Потоковые оценки квантилей скорости и калорий по типам тренировок.
+
+`QuantileSketch` устроен как DDSketch: значения раскладываются по
+логарифмическим корзинам с основанием gamma = (1 + a) / (1 - a), где a —
+заданная относительная точность. Для любого квантиля q оценка x' и точное
+значение x того же ранга связаны как |x' - x| <= a * |x|, пока число
+корзин не превысило max_buckets. При превышении сливаются корзины
+с наименьшими по модулю значениями, и гарантия перестаёт действовать
+только для квантилей, попавших в слитые корзины. Памяти нужно
+O(max_buckets) независимо от числа значений; наброски с одинаковой
+точностью складываются через `merge`, в том числе из разных процессов
+(объекты сериализуются `pickle` или через `to_dict`).
+
+Бесконечные значения и NaN (например, скорость при почти нулевой
+длительности) в корзины не попадают и на квантили не влияют: они
+считаются отдельно в `non_finite`.
+"""
+import math
+from typing import Dict, Iterable, Optional, Sequence
+
+from homework import Training
+
+DEFAULT_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+# значения меньше этого по модулю считаются нулём
+MIN_INDEXABLE = 1e-9
+
+
+class QuantileSketch:
+    """Сливаемый набросок квантилей с относительной погрешностью."""
+
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_ACCURACY,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS,
+                 ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('точность должна быть в интервале (0, 1)')
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.non_finite = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Учесть значение weight раз; inf и NaN только подсчитываются."""
+        if not math.isfinite(value):
+            self.non_finite += weight
+            return
+        if value > MIN_INDEXABLE:
+            store = self.positive
+        elif value < -MIN_INDEXABLE:
+            store = self.negative
+        else:
+            self.zero_count += weight
+            store = None
+        if store is not None:
+            key = self._key(abs(value))
+            store[key] = store.get(key, 0) + weight
+            if len(store) > self.max_buckets:
+                self._collapse(store)
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update(self, values: Iterable[float]) -> None:
+        """Учесть все значения."""
+        for value in values:
+            self.add(value)
+
+    def _collapse(self, store: Dict[int, int]) -> None:
+        """Слить корзины с наименьшими ключами, оставив max_buckets."""
+        keys = sorted(store)
+        excess = keys[:len(keys) - self.max_buckets]
+        target = keys[len(excess)]
+        store[target] += sum(store.pop(key) for key in excess)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Прибавить другой набросок с той же точностью."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('сливать можно только наброски одной точности')
+        for mine, theirs in ((self.positive, other.positive),
+                             (self.negative, other.negative)):
+            for key, weight in theirs.items():
+                mine[key] = mine.get(key, 0) + weight
+            if len(mine) > self.max_buckets:
+                self._collapse(mine)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.non_finite += other.non_finite
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценка квантиля q из [0, 1]; None для пустого наброска."""
+        if not 0 <= q <= 1:
+            raise ValueError('квантиль должен быть в отрезке [0, 1]')
+        if not self.count:
+            return None
+        if q == 0 or q == 1:
+            return self.min if q == 0 else self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(-self._value(key), self.min)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self._value(key), self.max)
+        return self.max
+
+    def quantiles(self, qs: Sequence[float]) -> Dict[float, Optional[float]]:
+        """Оценки сразу нескольких квантилей."""
+        return {q: self.quantile(q) for q in qs}
+
+    def to_dict(self) -> dict:
+        """Представление для JSON."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_buckets': self.max_buckets,
+            'positive': {str(key): value
+                         for key, value in self.positive.items()},
+            'negative': {str(key): value
+                         for key, value in self.negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'non_finite': self.non_finite,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'QuantileSketch':
+        """Восстановить набросок из `to_dict`."""
+        sketch = cls(state['relative_accuracy'], state['max_buckets'])
+        sketch.positive = {int(key): value
+                           for key, value in state['positive'].items()}
+        sketch.negative = {int(key): value
+                           for key, value in state['negative'].items()}
+        sketch.zero_count = state['zero_count']
+        sketch.count = state['count']
+        sketch.non_finite = state.get('non_finite', 0)
+        if sketch.count:
+            sketch.min, sketch.max = state['min'], state['max']
+        return sketch
+
+
+METRICS = ('speed', 'calories')
+
+
+class WorkoutSketches:
+    """Наброски скорости и калорий для каждого типа тренировки."""
+
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_ACCURACY,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS,
+                 ) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.sketches: Dict[str, Dict[str, QuantileSketch]] = {}
+
+    def _for(self, training_type: str) -> Dict[str, QuantileSketch]:
+        sketches = self.sketches.get(training_type)
+        if sketches is None:
+            sketches = self.sketches[training_type] = {
+                metric: QuantileSketch(self.relative_accuracy,
+                                       self.max_buckets)
+                for metric in METRICS}
+        return sketches
+
+    def add(self, training: Training) -> None:
+        """Учесть скорость и калории тренировки."""
+        sketches = self._for(training.__class__.__name__)
+        sketches['speed'].add(training.get_mean_speed())
+        sketches['calories'].add(training.get_spent_calories())
+
+    def merge(self, other: 'WorkoutSketches') -> None:
+        """Прибавить наброски, собранные в другом месте."""
+        for training_type, theirs in other.sketches.items():
+            mine = self._for(training_type)
+            for metric in METRICS:
+                mine[metric].merge(theirs[metric])
+
+    def report(self, qs: Sequence[float] = (0.5, 0.9, 0.99)) -> dict:
+        """Квантили по типам тренировок и показателям."""
+        return {training_type: {metric: sketch.quantiles(qs)
+                                for metric, sketch in sketches.items()}
+                for training_type, sketches in self.sketches.items()}
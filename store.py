@@ -0,0 +1,233 @@
+"""Пересчёт архивов с сохранением результатов и продолжением после сбоя.
+
+Результаты дописываются в ``results.jsonl`` внутри каталога хранилища,
+по записи на пакет: источник, смещение строки в байтах, версия
+коэффициентов класса тренировки и поля `InfoMessage`. Старые записи не
+переписываются; более поздняя запись для того же смещения заменяет
+прежнюю. Прогресс сохраняется в ``checkpoint.json`` атомарной заменой
+файла уже после того, как результаты сброшены на диск.
+
+Версия коэффициентов — хэш констант класса (атрибутов в верхнем регистре)
+и байт-кода его методов ``get_*`` по всей цепочке наследования. При
+повторном запуске с теми же версиями обработка продолжается с сохранённого
+смещения; если формула какого-то класса изменилась, файл читается с
+начала, но пересчитываются только пакеты, чьи результаты получены
+с другой версией.
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+from types import CodeType
+from typing import IO, Dict, Iterator, Optional, Sequence, Tuple, Type
+
+from homework import TRAINING_TYPES, InfoMessage, Training, read_package
+from stream import detect_format, iter_packets
+
+RESULTS = 'results.jsonl'
+CHECKPOINT = 'checkpoint.json'
+DEFAULT_CHECKPOINT_EVERY = 10000
+
+
+def _hash_code(code: CodeType, digest: 'hashlib._Hash') -> None:
+    """Добавить в хэш байт-код, имена и константы функции."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def _stable_repr(value: object) -> str:
+    """Запись значения, не зависящая от случайного хэширования строк."""
+    if isinstance(value, (set, frozenset)):
+        return '{' + ', '.join(sorted(map(_stable_repr, value))) + '}'
+    return repr(value)
+
+
+def coefficients_version(training_class: Type[Training]) -> str:
+    """Версия констант и формул класса тренировки."""
+    digest = hashlib.sha256()
+    for klass in training_class.__mro__[:-1]:
+        digest.update(klass.__qualname__.encode())
+        for name, value in sorted(vars(klass).items()):
+            if name.isupper():
+                digest.update(f'{name}={_stable_repr(value)}'.encode())
+            elif name.startswith('get_') and callable(value):
+                digest.update(name.encode())
+                _hash_code(inspect.unwrap(value).__code__, digest)
+    return digest.hexdigest()[:16]
+
+
+def current_versions() -> Dict[str, str]:
+    """Версии коэффициентов всех зарегистрированных типов."""
+    return {code: coefficients_version(registered.training_class)
+            for code, registered in TRAINING_TYPES.items()}
+
+
+class ResultStore:
+    """Дописываемое хранилище результатов с контрольными точками."""
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.results_path = os.path.join(directory, RESULTS)
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT)
+        # версия последнего результата для каждого (источник, смещение)
+        self.versions: Dict[Tuple[str, int], str] = {}
+        good = self._load()
+        self._sink: IO[str] = open(self.results_path, 'a', encoding='utf-8')
+        # хвост, оборванный сбоем посреди записи, отбрасывается
+        self._sink.truncate(good)
+
+    def _load(self) -> int:
+        """Прочитать индекс версий и вернуть длину целой части файла."""
+        good = 0
+        if not os.path.exists(self.results_path):
+            return good
+        with open(self.results_path, 'rb') as results:
+            for line in results:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                key = (record['source'], record['offset'])
+                self.versions[key] = record['version']
+                good += len(line)
+        return good
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Сбросить результаты на диск и закрыть файл."""
+        if not self._sink.closed:
+            self.sync()
+            self._sink.close()
+
+    def append(self, source: str, offset: int, version: str,
+               info: InfoMessage) -> None:
+        """Дописать результат пакета."""
+        record = {'source': source, 'offset': offset, 'version': version,
+                  'info': [info.training_type, info.duration,
+                           info.distance, info.speed, info.calories]}
+        self._sink.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.versions[(source, offset)] = version
+
+    def sync(self) -> None:
+        """Дождаться, пока записанные результаты окажутся на диске."""
+        self._sink.flush()
+        os.fsync(self._sink.fileno())
+
+    def checkpoint(self, source: str) -> Optional[dict]:
+        """Сохранённый прогресс по источнику."""
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, encoding='utf-8') as file:
+            return json.load(file).get(source)
+
+    def save_checkpoint(self, source: str, offset: int,
+                        versions: Dict[str, str]) -> None:
+        """Атомарно запомнить, что источник обработан до offset."""
+        self.sync()
+        state = {}
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as file:
+                state = json.load(file)
+        state[source] = {'offset': offset, 'versions': versions}
+        temporary = self.checkpoint_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(state, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.checkpoint_path)
+
+    def results(self, source: str) -> Dict[int, InfoMessage]:
+        """Последние результаты источника по смещениям строк."""
+        self._sink.flush()
+        found: Dict[int, InfoMessage] = {}
+        with open(self.results_path, encoding='utf-8') as results:
+            for line in results:
+                record = json.loads(line)
+                if record['source'] == source:
+                    found[record['offset']] = InfoMessage(*record['info'])
+        return found
+
+
+def _iter_lines(file: IO[bytes],
+                offset: int) -> Iterator[Tuple[int, int, str]]:
+    """Строки файла со смещениями их начала и конца, начиная с offset."""
+    file.seek(offset)
+    for line in file:
+        end = offset + len(line)
+        yield offset, end, line.decode('utf-8')
+        offset = end
+
+
+def reprocess(path: str,
+              store: ResultStore,
+              fmt: Optional[str] = None,
+              checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+              ) -> Dict[str, int]:
+    """Пересчитать архив в хранилище, продолжив с контрольной точки.
+
+    Возвращает, с какого смещения начата обработка и сколько пакетов
+    посчитано и пропущено.
+    """
+    fmt = fmt or detect_format(path)
+    source = os.path.abspath(path)
+    versions = current_versions()
+    saved = store.checkpoint(source)
+    start = 0
+    if saved is not None and saved['versions'] == versions:
+        start = saved['offset']
+    computed = skipped = 0
+    end = start
+    with open(path, 'rb') as file:
+        for offset, end, line in _iter_lines(file, start):
+            for workout_type, data in iter_packets([line], fmt):
+                version = versions.get(workout_type)
+                if (version is not None
+                        and store.versions.get((source, offset)) == version):
+                    skipped += 1
+                    continue
+                info = read_package(workout_type, data).show_training_info()
+                store.append(source, offset, version, info)
+                computed += 1
+                if computed % checkpoint_every == 0:
+                    store.save_checkpoint(source, end, versions)
+    store.save_checkpoint(source, end, versions)
+    return {'start': start, 'computed': computed, 'skipped': skipped}
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Пересчёт архива пакетов в хранилище результатов.')
+    parser.add_argument('path', help='файл с пакетами')
+    parser.add_argument('--store', required=True,
+                        help='каталог хранилища результатов')
+    parser.add_argument('--format', choices=('jsonl', 'csv'),
+                        help='формат входа, по умолчанию по расширению')
+    parser.add_argument('--checkpoint-every', type=int,
+                        default=DEFAULT_CHECKPOINT_EVERY,
+                        help='сохранять прогресс через столько пакетов')
+    args = parser.parse_args(argv)
+    with ResultStore(args.store) as store:
+        summary = reprocess(args.path, store, args.format,
+                            args.checkpoint_every)
+    print(summary, file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
@@ -0,0 +1,190 @@
+"""Потоковая обработка пакетов от датчиков из файлов и стандартного ввода.
+
+Пакеты читаются по одному на строку в формате JSON Lines
+(``["RUN", [15000, 1, 75]]`` или ``{"workout_type": "RUN", "data": [...]}``)
+или CSV (``RUN,15000,1,75``). Все стадии — генераторы, поэтому расход памяти
+не зависит от размера входа.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from contextlib import nullcontext
+from itertools import islice
+from typing import (ContextManager, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+import instrument
+from cache import ResultCache
+from compressed import compression, open_archive
+from homework import InfoMessage, Training, read_package
+from report import write_lines, write_messages
+
+Package = Tuple[str, List[float]]
+
+FORMATS = ('jsonl', 'csv')
+
+
+def _number(text: str) -> float:
+    """Превратить текстовое поле в число."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_json(line: str) -> Package:
+    """Разобрать пакет из строки JSON."""
+    packet = json.loads(line)
+    if isinstance(packet, dict):
+        return packet['workout_type'], packet['data']
+    workout_type, data = packet
+    return workout_type, data
+
+
+def parse_csv(row: Sequence[str]) -> Package:
+    """Разобрать пакет из строки CSV."""
+    return row[0], [_number(field) for field in row[1:]]
+
+
+def iter_packets(lines: Iterable[str],
+                 fmt: str = 'jsonl') -> Iterator[Package]:
+    """Лениво прочитать пакеты из последовательности строк."""
+    if fmt == 'jsonl':
+        return (parse_json(line) for line in lines if line.strip())
+    if fmt == 'csv':
+        return (parse_csv(row) for row in csv.reader(lines) if row)
+    raise ValueError(f'неизвестный формат: {fmt}')
+
+
+def iter_trainings(packets: Iterable[Package]) -> Iterator[Training]:
+    """Лениво создать тренировки из пакетов."""
+    return (read_package(workout_type, data) for workout_type, data in packets)
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Нарезать поток на списки длиной не больше size."""
+    if size < 1:
+        raise ValueError('размер пачки должен быть положительным')
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def detect_format(path: str) -> str:
+    """Определить формат входа по расширению файла."""
+    suffix = compression(path)
+    if suffix is not None:
+        path = path[:-len(suffix)]
+    return 'csv' if path.endswith('.csv') else 'jsonl'
+
+
+def compute_info(workout_type: str, data: List[float]) -> InfoMessage:
+    """Посчитать сообщение для одного пакета."""
+    return read_package(workout_type, data).show_training_info()
+
+
+def run(lines: Iterable[str],
+        fmt: str = 'jsonl',
+        chunk_size: int = 1,
+        cache: Optional[ResultCache] = None) -> int:
+    """Посчитать пакеты и вывести сообщения, вернуть число пакетов.
+
+    Сообщения каждой пачки выводятся одной записью в stdout. С cache
+    повторно присланные пакеты берутся из кэша. При включённых замерах
+    `instrument` обращение к кэшу записывается в стадию compute, а
+    стадия construct не замеряется.
+    """
+    recorder = instrument.active()
+    if recorder is not None:
+        return _run_recorded(lines, fmt, chunk_size, recorder, cache)
+    get_info = compute_info if cache is None else cache.get_info
+    count = 0
+    for chunk in iter_chunks(iter_packets(lines, fmt), chunk_size):
+        count += write_messages(
+            [get_info(workout_type, data) for workout_type, data in chunk])
+    return count
+
+
+def _run_recorded(lines: Iterable[str], fmt: str, chunk_size: int,
+                  recorder: instrument.Recorder,
+                  cache: Optional[ResultCache] = None) -> int:
+    """То же, что `run`, но с замером времени каждой стадии."""
+    clock, record = time.perf_counter_ns, recorder.record
+    packets = iter_packets(lines, fmt)
+    count = 0
+    while True:
+        messages = []
+        for _ in range(chunk_size):
+            started = clock()
+            package = next(packets, None)
+            if package is None:
+                break
+            workout_type, data = package
+            parsed = clock()
+            if cache is None:
+                training = read_package(workout_type, data)
+                built = clock()
+                info = training.show_training_info()
+            else:
+                built = parsed
+                info = cache.get_info(workout_type, data)
+            computed = clock()
+            messages.append(info.get_message())
+            formatted = clock()
+            record('parse', workout_type, parsed - started)
+            if cache is None:
+                record('construct', workout_type, built - parsed)
+            record('compute', workout_type, computed - built)
+            record('format', workout_type, formatted - computed)
+        if not messages:
+            return count
+        started = clock()
+        count += write_lines(messages)
+        record('output', 'all', clock() - started)
+
+
+def open_source(path: str) -> ContextManager[Iterable[str]]:
+    """Открыть файл с пакетами; ``-`` означает стандартный ввод.
+
+    Архивы ``.gz``, ``.bz2``, ``.xz`` и ``.lzma`` распаковываются на лету.
+    """
+    if path == '-':
+        return nullcontext(sys.stdin)
+    if compression(path) is not None:
+        return open_archive(path)
+    return open(path, encoding='utf-8', newline='')
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Расчёт тренировок по пакетам из файла или stdin.')
+    parser.add_argument('path', nargs='?', default='-',
+                        help='файл с пакетами, по умолчанию stdin')
+    parser.add_argument('--format', choices=FORMATS,
+                        help='формат входа, по умолчанию по расширению')
+    parser.add_argument('--chunk-size', type=int, default=1024,
+                        help='сколько пакетов обрабатывать за раз')
+    parser.add_argument('--stats',
+                        help='замерить стадии и сохранить JSON при выходе')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='кэшировать столько последних пакетов')
+    args = parser.parse_args(argv)
+    if args.stats:
+        instrument.enable(args.stats)
+    fmt = args.format or detect_format(args.path)
+    cache = ResultCache(args.cache_size) if args.cache_size else None
+    with open_source(args.path) as source:
+        run(source, fmt, args.chunk_size, cache)
+    if cache is not None:
+        print(cache.stats(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(cli())
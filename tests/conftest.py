@@ -1,3 +1,4 @@
+import random
 import sys
 from pathlib import Path
 from io import StringIO
@@ -26,6 +27,22 @@ class Capturing(list):
         del self._stringio  # free up some memory
         sys.stdout = self._stdout
 
+
+def random_packages(count, seed=0):
+    rnd = random.Random(seed)
+    packages = []
+    for _ in range(count):
+        action = rnd.randint(1, 40000)
+        duration = rnd.uniform(0.1, 5)
+        weight = rnd.uniform(40, 120)
+        packages.append(rnd.choice([
+            ('SWM', [action, duration, weight,
+                     rnd.uniform(10, 50), rnd.randint(1, 80)]),
+            ('RUN', [action, duration, weight]),
+            ('WLK', [action, duration, weight, rnd.uniform(1.4, 2.1)]),
+        ]))
+    return packages
+
         
 def pytest_make_parametrize_id(config, val):
     return repr(val)
@@ -0,0 +1,59 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+import aggregate
+import homework
+
+MONDAY = datetime(2024, 1, 8, 9, tzinfo=timezone.utc)
+
+
+def info(workout_type, data):
+    return homework.read_package(workout_type, data).show_training_info()
+
+
+@pytest.fixture
+def store():
+    store = aggregate.UserAggregates()
+    store.add('ann', MONDAY, 'RUN', [15000, 1, 75])
+    store.add('ann', MONDAY.replace(hour=18), 'WLK', [9000, 1, 75, 180])
+    store.add('ann', MONDAY.replace(day=10).timestamp(), 'SWM',
+              [720, 1, 80, 25, 40])
+    store.add('ann', MONDAY.replace(day=15), 'RUN', [1206, 12, 6])
+    store.add('bob', MONDAY, 'RUN', [1206, 12, 6])
+    return store
+
+
+def test_day(store):
+    run, walk = info('RUN', [15000, 1, 75]), info('WLK', [9000, 1, 75, 180])
+    totals = store.day('ann', date(2024, 1, 8))
+    assert totals.count == 2
+    assert totals.distance == run.distance + walk.distance
+    assert totals.calories == run.calories + walk.calories
+    assert totals.mean_calories == (run.calories + walk.calories) / 2
+    assert store.day('ann', date(2024, 1, 9)) == aggregate.Totals()
+
+
+def test_week_and_window(store):
+    week = store.week('ann', date(2024, 1, 14))
+    assert week.count == 3, 'Неделя ISO должна включать пн-вс.'
+    assert store.week('ann', date(2024, 1, 15)).count == 1
+    window = store.window('ann', date(2024, 1, 8), date(2024, 1, 15))
+    assert window.count == 4
+    assert window.calories == pytest.approx(
+        week.calories + store.day('ann', date(2024, 1, 15)).calories)
+    assert store.window('bob', date(2024, 1, 8), date(2024, 1, 8)).count == 1
+
+
+def test_empty_totals():
+    totals = aggregate.Totals()
+    assert totals.mean_distance == totals.mean_calories == 0.0
+
+
+def test_same_instant_same_day():
+    moscow = datetime(2024, 1, 8, 1, tzinfo=timezone(timedelta(hours=3)))
+    assert aggregate.to_date(moscow) == aggregate.to_date(
+        moscow.timestamp()) == date(2024, 1, 7), (
+        'Один и тот же момент должен попадать в один день UTC.'
+    )
+    assert aggregate.to_date(datetime(2024, 1, 8, 1)) == date(2024, 1, 8)
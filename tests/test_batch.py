@@ -0,0 +1,117 @@
+import io
+import json
+
+import pytest
+from conftest import random_packages
+
+import batch
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [420, 4, 20, 42, 4]),
+    ('SWM', [1206, 12, 6, 12, 6]),
+    ('RUN', [15000, 1, 75]),
+    ('RUN', [420, 4, 20]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('WLK', [420, 4, 20, 42]),
+    ('WLK', [1206, 12, 6, 12]),
+]
+
+
+@pytest.mark.parametrize('packages', [PACKAGES, random_packages(2000)],
+                         ids=['tests', 'random'])
+def test_compute_packages_matches_scalar(packages):
+    results = batch.compute_packages(packages)
+    positions = {workout_type: 0 for workout_type in results}
+    for workout_type, data in packages:
+        training = homework.read_package(workout_type, data)
+        result = results[workout_type]
+        index = positions[workout_type]
+        positions[workout_type] += 1
+        assert result.training_type == type(training).__name__
+        assert result.distance[index] == training.get_distance(), (
+            'Пакетная дистанция должна совпадать с `get_distance`.'
+        )
+        assert result.speed[index] == training.get_mean_speed(), (
+            'Пакетная скорость должна совпадать с `get_mean_speed`.'
+        )
+        assert result.calories[index] == training.get_spent_calories(), (
+            'Пакетные калории должны совпадать с `get_spent_calories`.'
+        )
+
+
+def test_compute_batch_columns():
+    result = batch.compute_batch('WLK', [[9000], [1], [75], [180]])
+    assert len(result) == 1
+    assert list(result.duration) == [1]
+    assert result.calories == [157.50000000000003]
+
+
+def test_compute_batch_unknown_type():
+    with pytest.raises(ValueError):
+        batch.compute_batch('BIKE', [[1], [1], [1]])
+
+
+def test_validate_packages():
+    nan = float('nan')
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('RUN', [15000, 0, 75]),
+        ('BIKE', [1, 1, 1]),
+        ('WLK', [9000, 1, 75]),
+        ('WLK', [9000, 1, 75, 0]),
+        ('SWM', [720, 1, nan, 25, 40]),
+        ('SWM', [720, 1, 80, -25, 40]),
+        ('SWM', [720, 1, 80, 25, '40']),
+        ('WLK', [9000, 1, 75, 180]),
+        ('WLK', [9000, 1e-300, 75, 180]),
+        ('RUN', [15000, 1e-320, 75]),
+    ]
+    sink = io.StringIO()
+    validated = batch.validate_packages(packages, sink)
+    assert [(rejection.index, rejection.reason)
+            for rejection in validated.rejected] == [
+        (1, 'duration:not_positive'),
+        (2, 'unknown_type'),
+        (3, 'arity'),
+        (4, 'height:not_positive'),
+        (5, 'weight:nan'),
+        (6, 'length_pool:not_positive'),
+        (7, 'count_pool:not_number'),
+        (9, 'speed:overflow'),
+        (10, 'speed:overflow'),
+    ], 'Каждый некорректный пакет должен получить свою причину отказа.'
+    assert [json.loads(line)['index'] for line in
+            sink.getvalue().splitlines()] == [1, 2, 3, 4, 5, 6, 7, 9, 10]
+    assert validated.indices == {'RUN': [0], 'WLK': [8]}
+    results = validated.compute()
+    assert results == batch.compute_packages([packages[0], packages[8]])
+
+
+def test_validate_malformed_packages():
+    packages = [
+        ('RUN', None),
+        ('RUN', 5),
+        (['RUN'], [15000, 1, 75]),
+        ({'RUN'}, [15000, 1, 75]),
+        ('RUN', '150'),
+        ('RUN',),
+        None,
+        ('RUN', [15000, 1, 75]),
+    ]
+    sink = io.StringIO()
+    validated = batch.validate_packages(packages, sink)
+    assert [(rejection.index, rejection.reason)
+            for rejection in validated.rejected] == [
+        (index, 'malformed') for index in range(7)
+    ], 'Неразборчивый пакет должен отсекаться без исключения.'
+    assert len(sink.getvalue().splitlines()) == 7
+    assert validated.indices == {'RUN': [7]}
+
+
+def test_validate_packages_all_valid():
+    validated = batch.validate_packages(PACKAGES)
+    assert validated.rejected == []
+    assert validated.compute() == batch.compute_packages(PACKAGES)
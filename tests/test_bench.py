@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+import bench
+
+
+def test_generate_packages():
+    for workout_type, arity in (('RUN', 3), ('WLK', 4), ('SWM', 5)):
+        packages = list(bench.generate_packages(workout_type, 10))
+        assert len(packages) == 10
+        assert all(len(data) == arity for _, data in packages)
+
+
+@pytest.mark.parametrize('stage', list(bench.STAGES))
+def test_measure(stage):
+    result = bench.measure(stage, 'SWM', 250, block_size=100)
+    assert result['packets'] == 250
+    assert result['per_second'] > 0
+    assert result['p99_us'] >= result['p50_us']
+
+
+def test_compare():
+    baseline = {'parse/RUN/1000': {'per_second': 1000.0}}
+    assert bench.compare({'parse/RUN/1000': {'per_second': 950.0}},
+                         baseline, 0.1) == []
+    assert len(bench.compare({'parse/RUN/1000': {'per_second': 800.0}},
+                             baseline, 0.1)) == 1
+    assert bench.compare({'parse/SWM/1000': {'per_second': 1.0}},
+                         baseline, 0.1) == []
+
+
+def test_cli_baseline(tmp_path):
+    path = tmp_path / 'baseline.json'
+    args = ['--sizes', '200', '--stages', 'read_package', '--types', 'RUN']
+    assert bench.cli(args + ['--save', str(path)]) == 0
+    baseline = json.loads(path.read_text(encoding='utf-8'))
+    baseline['read_package/RUN/200']['per_second'] *= 1000
+    path.write_text(json.dumps(baseline), encoding='utf-8')
+    assert bench.cli(args + ['--baseline', str(path)]) == 1, (
+        'Падение скорости сверх порога должно завершаться ошибкой.'
+    )
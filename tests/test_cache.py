@@ -0,0 +1,69 @@
+import pytest
+from conftest import Capturing
+
+import cache
+import homework
+import stream
+
+
+def test_hits_and_misses():
+    results = cache.ResultCache(10)
+    first = results.get_info('RUN', [15000, 1, 75])
+    again = results.get_info('RUN', (15000, 1, 75))
+    assert again is first, 'Повторный пакет должен браться из кэша.'
+    assert first == homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info()
+    assert results.stats() == {'size': 1, 'maxsize': 10, 'hits': 1,
+                               'misses': 1, 'evictions': 0}
+
+
+def test_lru_eviction():
+    results = cache.ResultCache(2)
+    results.get_info('RUN', [1000, 1, 75])
+    results.get_info('RUN', [2000, 1, 75])
+    results.get_info('RUN', [1000, 1, 75])
+    results.get_info('RUN', [3000, 1, 75])
+    assert len(results) == 2
+    assert results.evictions == 1
+    results.get_info('RUN', [1000, 1, 75])
+    assert results.hits == 2, (
+        'Из кэша должен вытесняться самый давно использованный пакет.'
+    )
+    results.clear()
+    assert results.stats()['size'] == results.stats()['hits'] == 0
+
+
+def test_errors_are_not_cached():
+    results = cache.ResultCache()
+    with pytest.raises(ValueError):
+        results.get_info('BIKE', [1, 1, 1])
+    assert len(results) == 0
+
+
+def test_stream_with_cache():
+    lines = ['["RUN", [15000, 1, 75]]'] * 3 + ['["WLK", [9000, 1, 75, 180]]']
+    with Capturing() as plain:
+        stream.run(lines)
+    results = cache.ResultCache(4)
+    with Capturing() as cached:
+        stream.run(lines, chunk_size=2, cache=results)
+    assert cached == plain
+    assert results.hits == 2
+
+
+def test_shards():
+    assert len(cache.ResultCache(10)._shards) == 1
+    assert len(cache.ResultCache()._shards) == cache.DEFAULT_SHARDS
+    with pytest.raises(ValueError):
+        cache.ResultCache(4, shards=5)
+    results = cache.ResultCache(64, shards=4)
+    assert sum(shard.maxsize for shard in results._shards) == 64
+    for duration in range(1000, 1200):
+        results.get_info('RUN', [duration, 1, 75])
+    stats = results.stats()
+    assert stats['size'] == len(results) <= 64
+    assert stats['misses'] == 200
+    assert stats['evictions'] == 200 - stats['size']
+    assert all(shard.data for shard in results._shards), (
+        'Пакеты должны расходиться по всем сегментам кэша.'
+    )
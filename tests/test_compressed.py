@@ -0,0 +1,97 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+
+import pytest
+from conftest import Capturing, random_packages
+
+import compressed
+import stream
+
+
+def archive_text(count=300):
+    return ''.join(json.dumps(package, ensure_ascii=False) + '\n'
+                   for package in random_packages(count, seed=6))
+
+
+def gzip_members(data, size):
+    return b''.join(gzip.compress(data[start:start + size])
+                    for start in range(0, len(data), size))
+
+
+@pytest.mark.parametrize('member_size', [100, 1000, 10 ** 6])
+@pytest.mark.parametrize('block_size', [64, 4096])
+def test_gzip_blocks(member_size, block_size):
+    data = archive_text().encode()
+    archive = io.BytesIO(gzip_members(data, member_size))
+    blocks = compressed.iter_gzip_blocks(archive, 3, block_size)
+    assert b''.join(blocks) == data
+
+
+def test_gzip_false_signature():
+    data = b'\x1f\x8b\x08 not a member ' * 200
+    # без сжатия сигнатура попадает в сжатые данные как есть
+    archive = gzip.compress(data, compresslevel=0) + gzip.compress(data)
+    assert archive.count(compressed.GZIP_MAGIC) > 2
+    blocks = compressed.iter_gzip_blocks(io.BytesIO(archive), 2, 512)
+    assert b''.join(blocks) == data * 2, (
+        'Сигнатура внутри сжатых данных не должна ломать распаковку.'
+    )
+    assert compressed.inflate_members(archive[:100]) is None
+
+
+@pytest.mark.parametrize('padding', [1, 100, 5000])
+@pytest.mark.parametrize('block_size', [64, 4096])
+def test_gzip_zero_padding(padding, block_size):
+    data = archive_text().encode()
+    members = gzip.compress(data[:5000]), gzip.compress(data[5000:])
+    archive = members[0] + bytes(padding) + members[1] + bytes(padding)
+    assert gzip.decompress(archive) == data
+    blocks = compressed.iter_gzip_blocks(io.BytesIO(archive), 2, block_size)
+    assert b''.join(blocks) == data, (
+        'Нулевое дополнение после члена gzip нужно пропускать.'
+    )
+
+
+def test_gzip_truncated():
+    archive = gzip.compress(archive_text().encode())
+    with pytest.raises(EOFError):
+        b''.join(compressed.iter_gzip_blocks(
+            io.BytesIO(archive[:-20]), 2, 256))
+
+
+def test_iter_lines_joins_blocks():
+    data = 'первая строка\nвторая\nбез перевода'.encode()
+    blocks = [data[start:start + 3] for start in range(0, len(data), 3)]
+    assert list(compressed.iter_lines(blocks)) == [
+        'первая строка\n', 'вторая\n', 'без перевода']
+
+
+@pytest.mark.parametrize('suffix, module', [
+    ('.gz', gzip), ('.bz2', bz2), ('.xz', lzma), ('.lzma', lzma),
+])
+def test_open_archive(tmp_path, suffix, module):
+    text = archive_text()
+    path = tmp_path / ('packages.jsonl' + suffix)
+    path.write_bytes(module.compress(text.encode()))
+    with compressed.open_archive(str(path), block_size=1024) as lines:
+        assert ''.join(lines) == text
+    with pytest.raises(ValueError):
+        with compressed.open_archive(str(tmp_path / 'packages.jsonl')):
+            pass
+
+
+def test_stream_cli_reads_archives(tmp_path):
+    text = 'SWM,720,1,80,25,40\nRUN,15000,1,75\n'
+    plain = tmp_path / 'packages.csv'
+    plain.write_text(text, encoding='utf-8')
+    packed = tmp_path / 'packages.csv.gz'
+    packed.write_bytes(gzip_members(text.encode(), 10))
+    assert stream.detect_format(str(packed)) == 'csv'
+    with Capturing() as expected:
+        stream.cli([str(plain)])
+    with Capturing() as output:
+        stream.cli([str(packed)])
+    assert output == expected
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict
+
+import pytest
+
+import daemon
+import homework
+
+
+@pytest.fixture
+def running(tmp_path):
+    path = str(tmp_path / 'training.sock')
+    process = subprocess.Popen(
+        [sys.executable, daemon.__file__, 'start', '--socket', path])
+    try:
+        daemon.wait_ready(path)
+        yield path
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def test_request(running):
+    replies = daemon.request(
+        [b'["RUN", [15000, 1, 75]]', b'\n', b'["XXX", [1]]\n'], running)
+    expected = asdict(homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info())
+    assert json.loads(replies[0]) == expected, (
+        'Обработчик должен возвращать поля `InfoMessage`.'
+    )
+    assert 'error' in json.loads(replies[1])
+    with pytest.raises(RuntimeError):
+        daemon.start(running)
+
+
+def test_bad_packets_do_not_hang_daemon(tmp_path):
+    path = str(tmp_path / 'training.sock')
+    process = subprocess.Popen(
+        [sys.executable, daemon.__file__, 'start', '--socket', path,
+         '--workers', '1'])
+    try:
+        daemon.wait_ready(path)
+        bad = b'["WLK", [9000, 1e-300, 75, 180]]'
+        for _ in range(3):
+            reply, = daemon.request([bad], path, timeout=2)
+            assert 'error' in json.loads(reply)
+        reply, = daemon.request([b'["RUN", [15000, 1, 75]]'], path,
+                                timeout=2)
+        assert json.loads(reply)['training_type'] == 'Running', (
+            'Ошибки в пакетах не должны останавливать обработчик.'
+        )
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def test_client_does_not_import_homework(running):
+    code = ('import sys, daemon; '
+            'assert "homework" not in sys.modules; '
+            f'print(len(daemon.request([b\'["RUN", [1, 1, 1]]\'], '
+            f'{running!r})))')
+    output = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, check=True,
+        cwd=os.path.dirname(daemon.__file__), text=True)
+    assert output.stdout.strip() == '1'
+
+
+def test_stop_removes_socket(tmp_path):
+    path = str(tmp_path / 'training.sock')
+    process = subprocess.Popen(
+        [sys.executable, daemon.__file__, 'start', '--socket', path])
+    daemon.wait_ready(path)
+    process.terminate()
+    assert process.wait(10) == 0
+    assert not daemon.is_running(path)
+    assert not (tmp_path / 'training.sock').exists(), (
+        'Сокет должен удаляться при остановке обработчика.'
+    )
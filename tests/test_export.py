@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import math
+
+import pytest
+from conftest import random_packages
+
+import batch
+import export
+import homework
+
+
+@pytest.fixture
+def infos():
+    return [homework.read_package(*package).show_training_info()
+            for package in random_packages(500, seed=10)]
+
+
+def as_rows(infos):
+    return [tuple(getattr(info, name) for name in export.COLUMNS)
+            for info in infos]
+
+
+@pytest.mark.parametrize('batch_size', [1, 64, 10000])
+def test_binary_round_trip(infos, batch_size):
+    sink = io.BytesIO()
+    assert export.export_infos(infos, sink, 'binary', batch_size) == 500
+    sink.seek(0)
+    rows = [row for types, *metrics in export.read_binary(sink)
+            for row in zip(types, *metrics)]
+    assert rows == as_rows(infos), (
+        'Двоичная выгрузка должна сохранять значения до последнего бита.'
+    )
+
+
+def test_csv_and_jsonl(infos):
+    text = io.StringIO()
+    export.export_infos(infos, text, 'csv', batch_size=100)
+    parsed = [(row['training_type'], *map(float, list(row.values())[1:]))
+              for row in csv.DictReader(io.StringIO(text.getvalue()))]
+    assert parsed == as_rows(infos)
+    text = io.StringIO()
+    export.export_infos(infos, text, 'jsonl', batch_size=100)
+    parsed = [tuple(json.loads(line).values())
+              for line in text.getvalue().splitlines()]
+    assert parsed == as_rows(infos)
+
+
+def test_batch_results_and_missing_calories():
+    results = [batch.compute_batch('RUN', [[15000, 9000], [1, 2], [75, 80]]),
+               batch.BatchResult('Training, "base"', [1.0], [0.65], [0.65],
+                                 [None])]
+    text = io.StringIO()
+    assert export.export_results(results, text, 'csv') == 3
+    rows = list(csv.reader(io.StringIO(text.getvalue())))
+    assert rows[-1] == ['Training, "base"', '1.0', '0.65', '0.65', '']
+    text = io.StringIO()
+    export.export_results(results, text, 'jsonl')
+    assert json.loads(text.getvalue().splitlines()[-1])['calories'] is None
+    sink = io.BytesIO()
+    export.export_results(results, sink, 'binary', batch_size=1)
+    sink.seek(0)
+    blocks = list(export.read_binary(sink))
+    assert len(blocks) == 3
+    assert blocks[0][0] == ['Running']
+    assert math.isnan(blocks[-1][4][0])
+    sink.seek(0)
+    with pytest.raises(ValueError):
+        list(export.read_binary(io.BytesIO(sink.read()[:-4])))
+
+
+def test_cli(tmp_path):
+    source = tmp_path / 'packages.jsonl'
+    source.write_text(''.join(json.dumps(package) + '\n'
+                              for package in random_packages(50, seed=11)),
+                      encoding='utf-8')
+    output = tmp_path / 'out.bin'
+    assert export.cli([str(source), '--output', str(output),
+                       '--to', 'binary', '--batch-size', '16']) == 0
+    with open(output, 'rb') as sink:
+        assert sum(len(types) for types, *_ in export.read_binary(sink)) == 50
+
+
+@pytest.mark.parametrize('batch_size', [1, 16, 1000])
+def test_packages_keep_input_order(batch_size):
+    packages = random_packages(200, seed=12)
+    infos = [homework.read_package(*package).show_training_info()
+             for package in packages]
+    columns = export.iter_package_columns(packages, batch_size)
+    rows = [row for types, *metrics in columns
+            for row in zip(export._names(types, len(metrics[0]), str),
+                           *metrics)]
+    assert rows == as_rows(infos), (
+        'Строки выгрузки должны идти в порядке входных пакетов.'
+    )
+
+
+def test_cli_keeps_input_order(tmp_path):
+    packages = random_packages(50, seed=13)
+    source = tmp_path / 'packages.jsonl'
+    source.write_text(''.join(json.dumps(package) + '\n'
+                              for package in packages), encoding='utf-8')
+    output = tmp_path / 'out.jsonl'
+    assert export.cli([str(source), '--output', str(output),
+                       '--to', 'jsonl', '--batch-size', '16']) == 0
+    types = [json.loads(line)['training_type']
+             for line in output.read_text(encoding='utf-8').splitlines()]
+    assert types == [homework.TRAINING_TYPES[code].training_class.__name__
+                     for code, _ in packages]
+
+
+def test_non_finite_values():
+    results = [batch.BatchResult('Running', [1.0, 2.0],
+                                 [math.inf, 1.5], [math.nan, 0.75],
+                                 [-math.inf, None])]
+    text = io.StringIO()
+    export.export_results(results, text, 'jsonl')
+    rows = [json.loads(line) for line in text.getvalue().splitlines()]
+    assert rows[0] == {'training_type': 'Running', 'duration': 1.0,
+                       'distance': None, 'speed': None, 'calories': None}
+    assert rows[1]['distance'] == 1.5
+    text = io.StringIO()
+    export.export_results(results, text, 'csv')
+    rows = list(csv.reader(io.StringIO(text.getvalue())))
+    assert rows[1] == ['Running', '1.0', '', '', '']
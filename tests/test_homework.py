@@ -1,4 +1,5 @@
 import pytest
+import dataclasses
 import types
 import inspect
 from conftest import Capturing
@@ -384,3 +385,133 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('input_data, changes, changed_data', [
+    (['RUN', [15000, 1, 75]], {'action': 9000, 'duration': 2},
+     [9000, 2, 75]),
+    (['WLK', [9000, 1, 75, 180]], {'weight': 60, 'height': 170},
+     [9000, 1, 60, 170]),
+    (['SWM', [720, 1, 80, 25, 40]], {'length_pool': 50, 'count_pool': 20},
+     [720, 1, 80, 50, 20]),
+])
+def test_metrics_cache(input_data, changes, changed_data):
+    workout_type, data = input_data
+    training = homework.read_package(workout_type, data)
+    speed = training.get_mean_speed()
+    assert training.get_mean_speed() is speed, (
+        'Средняя скорость тренировки должна считаться один раз.'
+    )
+    for name, value in changes.items():
+        setattr(training, name, value)
+    fresh = homework.read_package(workout_type, changed_data)
+    assert training.show_training_info() == fresh.show_training_info(), (
+        'После изменения параметров тренировки показатели '
+        'должны пересчитываться.'
+    )
+
+
+class Cadence(homework.Training):
+    """Тренировка с собственным параметром, влияющим на скорость."""
+
+    def __init__(self, action, duration, weight, cadence):
+        super().__init__(action, duration, weight)
+        self.cadence = cadence
+
+    def get_mean_speed(self):
+        speed = self._speed
+        if speed is None:
+            speed = self._speed = self.cadence / 10
+        return speed
+
+
+def test_plugin_inputs_reset_cache():
+    assert Cadence.INPUTS == ('action', 'duration', 'weight', 'cadence')
+    training = Cadence(1000, 2, 70, 80)
+    assert training.get_mean_speed() == 8
+    training.cadence = 90
+    assert training.get_mean_speed() == 9, (
+        'Смена собственного параметра плагина должна сбрасывать кэш.'
+    )
+    assert isinstance(homework.Training.INPUTS, tuple)
+
+
+class Cycling(homework.Training):
+    """Тренировка: велосипед."""
+    LEN_STEP: float = 5.0
+
+    def get_spent_calories(self) -> float:
+        return 0.5 * self.weight * self.duration
+
+
+@pytest.fixture
+def cycling():
+    yield homework.register_training('CYC', Cycling)
+    homework.unregister_training('CYC')
+
+
+def test_register_training(cycling):
+    assert cycling.arity == 3
+    assert homework.TRAINING_TYPES['CYC'] is cycling
+    training = homework.read_package('CYC', [1000, 2, 70])
+    assert isinstance(training, Cycling)
+    assert training.show_training_info().calories == 70.0
+    with pytest.raises(ValueError):
+        homework.register_training('CYC', Cycling)
+    import batch
+
+    result = batch.compute_packages([('CYC', [1000, 2, 70])])['CYC']
+    assert result.calories == [70.0], (
+        'Пакетный расчёт плагина без своего ядра должен совпадать '
+        'с методами объекта.'
+    )
+    assert result.distance == [training.get_distance()]
+
+
+@pytest.mark.parametrize('input_data', [
+    ('RUN', [15000, 1]),
+    ('WLK', [9000, 1, 75, 180, 1]),
+    ('XYZ', [1, 1, 1]),
+])
+def test_read_package_errors(input_data):
+    with pytest.raises(ValueError):
+        homework.read_package(*input_data)
+
+
+@pytest.mark.parametrize('input_data', [
+    ['SWM', [720, 1, 80, 25, 40]],
+    ['RUN', [1206, 12, 6]],
+    ['WLK', [9000, 1, 75, 180]],
+])
+def test_lazy_info_message(input_data, monkeypatch):
+    training = homework.read_package(*input_data)
+    expected = homework.read_package(*input_data).show_training_info()
+
+    def forbidden():
+        raise AssertionError('Калории не должны считаться без обращения.')
+    monkeypatch.setattr(training, 'get_spent_calories', forbidden)
+    info = training.show_lazy_info()
+    assert info.training_type == expected.training_type
+    assert info.distance == expected.distance
+    assert info.speed == expected.speed
+    monkeypatch.undo()
+    assert info.get_message() == expected.get_message(), (
+        'Ленивое сообщение должно давать тот же текст, что `InfoMessage`.'
+    )
+    assert info == expected
+    assert info.materialize() == expected
+
+
+def test_lazy_info_message_fields():
+    training = homework.read_package('RUN', [15000, 1, 75])
+    info = training.show_lazy_info()
+    training.duration = 2
+    expected = homework.read_package('RUN', [15000, 2, 75])
+    assert info.get_message() == (
+        expected.show_training_info().get_message()), (
+        'Все поля ленивого сообщения должны браться по одним данным.'
+    )
+    assert dataclasses.asdict(info) == dataclasses.asdict(
+        expected.show_training_info())
+    assert [field.name for field in dataclasses.fields(info)] == [
+        'training_type', 'duration', 'distance', 'speed', 'calories']
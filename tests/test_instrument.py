@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from conftest import Capturing
+
+import cache
+import instrument
+import stream
+
+LINES = [
+    '["SWM", [720, 1, 80, 25, 40]]',
+    '["RUN", [15000, 1, 75]]',
+    '["RUN", [1206, 12, 6]]',
+]
+
+
+@pytest.fixture
+def recorder():
+    yield instrument.enable()
+    instrument.disable()
+
+
+def test_disabled_by_default():
+    assert instrument.active() is None
+
+
+def test_run_records_stages(recorder):
+    with Capturing() as recorded:
+        stream.run(LINES, chunk_size=2)
+    instrument.disable()
+    with Capturing() as plain:
+        stream.run(LINES, chunk_size=2)
+    assert recorded == plain, (
+        'Замеры не должны менять вывод конвейера.'
+    )
+    snapshot = recorder.snapshot()
+    assert set(snapshot) == set(instrument.STAGES)
+    for stage in ('parse', 'construct', 'compute', 'format'):
+        assert snapshot[stage]['RUN']['count'] == 2
+        assert snapshot[stage]['SWM']['count'] == 1
+    assert snapshot['output']['all']['count'] == 2
+    histogram = snapshot['compute']['RUN']['histogram_ns']
+    assert sum(histogram.values()) == 2
+
+
+def test_record_and_dump(tmp_path, recorder):
+    recorder.record('compute', 'RUN', 1000)
+    recorder.record('compute', 'RUN', 3000)
+    path = tmp_path / 'stats.json'
+    recorder.dump(str(path))
+    stats = json.loads(path.read_text(encoding='utf-8'))['compute']['RUN']
+    assert stats['count'] == 2
+    assert stats['mean_us'] == 2.0
+    assert stats['histogram_ns'] == {'1024': 1, '4096': 1}
+    recorder.reset()
+    assert recorder.snapshot() == {}
+
+
+def test_run_records_with_cache(recorder):
+    results = cache.ResultCache(4)
+    with Capturing() as recorded:
+        stream.run(LINES * 2, chunk_size=2, cache=results)
+    assert results.stats()['hits'] == 3, (
+        'Замеры не должны отключать кэш.'
+    )
+    instrument.disable()
+    with Capturing() as plain:
+        stream.run(LINES * 2, chunk_size=2)
+    assert recorded == plain
+    snapshot = recorder.snapshot()
+    assert snapshot['compute']['RUN']['count'] == 4
+    assert 'construct' not in snapshot
@@ -0,0 +1,57 @@
+import pytest
+
+import homework
+import laps
+
+
+def test_running_laps_and_total():
+    session = laps.SessionStream('RUN', weight=75)
+    session.add(0.25, 3000)
+    first = session.add(0.5, 7000, end_lap=True)
+    session.add(1.0, 15000)
+    second = session.lap()
+    assert session.laps == [first, second]
+    assert first == homework.read_package(
+        'RUN', [7000, 0.5, 75]).show_training_info()
+    assert second == homework.read_package(
+        'RUN', [8000, 0.5, 75]).show_training_info()
+    assert session.total() == homework.read_package(
+        'RUN', [15000, 1.0, 75]).show_training_info(), (
+        'Итог тренировки должен совпадать с расчётом по сводному пакету.'
+    )
+
+
+def test_swimming_counts_pools():
+    session = laps.SessionStream('SWM', weight=80, length_pool=25)
+    session.add(0.5, 360, count_pool=20, end_lap=True)
+    session.add(1.0, 720, count_pool=40)
+    assert session.current() == homework.read_package(
+        'SWM', [360, 0.5, 80, 25, 20]).show_training_info()
+    assert session.total() == homework.read_package(
+        'SWM', [720, 1.0, 80, 25, 40]).show_training_info()
+
+
+def test_walking_requires_height():
+    with pytest.raises(ValueError):
+        laps.SessionStream('WLK', weight=75)
+    session = laps.SessionStream('WLK', weight=75, height=180)
+    session.add(1, 9000)
+    assert session.total().calories == 157.50000000000003
+
+
+@pytest.mark.parametrize('samples', [
+    [(0.5, 100, 0), (0.4, 200, 0)],
+    [(0.5, 100, 0), (0.6, 50, 0)],
+    [(0.5, 100, 4), (0.6, 200, 3)],
+])
+def test_samples_must_grow(samples):
+    session = laps.SessionStream('SWM', weight=80, length_pool=25)
+    with pytest.raises(ValueError):
+        for timestamp, action, count_pool in samples:
+            session.add(timestamp, action, count_pool)
+
+
+def test_empty_lap():
+    session = laps.SessionStream('RUN', weight=75)
+    with pytest.raises(ValueError):
+        session.lap()
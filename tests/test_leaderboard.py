@@ -0,0 +1,101 @@
+import random
+
+import pytest
+from conftest import random_packages
+
+import homework
+import leaderboard
+
+
+def brute_top(values, k):
+    ranked = sorted(values.items(), key=lambda item: -item[1])
+    return [value for _, value in ranked[:k]]
+
+
+@pytest.mark.parametrize('k', [1, 10])
+def test_board_matches_sorting(k):
+    rnd = random.Random(k)
+    board = leaderboard.Leaderboard(k)
+    live = {}
+    for step in range(3000):
+        action = rnd.random()
+        if live and action < 0.3:
+            retracted = rnd.choice(list(live))
+            del live[retracted]
+            assert board.remove(retracted)
+        else:
+            # иногда значение уже учтённой сессии обновляется
+            session_id = rnd.randrange(step + 1)
+            live[session_id] = round(rnd.uniform(0, 1000), 1)
+            board.add(session_id, live[session_id])
+        assert [value for _, value in board.top()] == brute_top(live, k), (
+            'Таблица должна совпадать с первыми k среди всех живых сессий.'
+        )
+    assert len(board._top) + len(board._rest) <= 2 * len(live) + 32, (
+        'Удалённые записи не должны копиться в кучах.'
+    )
+
+
+def test_board_without_removals_is_exact():
+    rnd = random.Random(7)
+    values = {session_id: rnd.uniform(0, 1000) for session_id in range(500)}
+    board = leaderboard.Leaderboard(5)
+    for session_id, value in values.items():
+        board.add(session_id, value)
+    assert [value for _, value in board.top()] == brute_top(values, 5)
+    assert not board.remove('нет такой')
+
+
+def test_board_refills_after_removal():
+    board = leaderboard.Leaderboard(2)
+    for session_id, value in (('a', 3.0), ('b', 2.0), ('c', 1.0)):
+        board.add(session_id, value)
+    assert board.top() == [('a', 3.0), ('b', 2.0)]
+    board.remove('a')
+    board.add('d', 0.5)
+    assert board.top() == [('b', 2.0), ('c', 1.0)], (
+        'Место отозванной сессии должна занимать лучшая из остальных.'
+    )
+    board.add('b', 0.1)
+    assert board.top() == [('c', 1.0), ('d', 0.5)]
+
+
+def test_index_refills_after_removal():
+    index = leaderboard.LeaderboardIndex(k=1)
+    index.add(1, 'RUN', [15000, 1, 75])
+    second = index.add(2, 'RUN', [9000, 1, 75])
+    index.remove(1)
+    assert index.top('calories') == [(2, second.get_spent_calories())]
+
+
+def test_index_session_changes_type():
+    index = leaderboard.LeaderboardIndex(k=3)
+    index.add('s1', 'RUN', [15000, 1, 75])
+    swimming = index.add('s1', 'SWM', [720, 1, 80, 25, 40])
+    assert index.top('calories', 'Running') == [], (
+        'Сессия со сменённым типом должна уйти из таблицы прежнего типа.'
+    )
+    assert index.top('calories', 'Swimming') == index.top('calories') == [
+        ('s1', swimming.get_spent_calories())]
+
+
+def test_index_per_type_and_global():
+    index = leaderboard.LeaderboardIndex(k=3)
+    trainings = {}
+    for session_id, (workout_type, data) in enumerate(
+            random_packages(300, seed=4)):
+        trainings[session_id] = index.add(session_id, workout_type, data)
+    index.remove(0)
+    del trainings[0]
+    calories = {session_id: training.get_spent_calories()
+                for session_id, training in trainings.items()}
+    assert [value for _, value in index.top('calories')] == brute_top(
+        calories, 3)
+    swimming = {session_id: training.get_mean_speed()
+                for session_id, training in trainings.items()
+                if isinstance(training, homework.Swimming)}
+    assert [value for _, value in index.top('speed', 'Swimming')] == (
+        brute_top(swimming, 3))
+    assert index.top('distance', 'Нет такого') == []
+    with pytest.raises(ValueError):
+        leaderboard.LeaderboardIndex(metrics=('pace',))
@@ -0,0 +1,79 @@
+import io
+import struct
+import zlib
+from array import array
+
+import pytest
+from conftest import random_packages
+
+import batch
+import packfile
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+def write(tmp_path, packages):
+    path = tmp_path / 'packets.bin'
+    with open(path, 'wb') as sink:
+        assert packfile.write_packets(sink, packages) == len(packages)
+    return str(path)
+
+
+def test_columns_are_views(tmp_path):
+    with packfile.PackFile(write(tmp_path, PACKAGES)) as packets:
+        assert len(packets) == len(PACKAGES)
+        columns = packets.columns('RUN')
+        assert all(isinstance(column, memoryview) for column in columns)
+        assert [column.tolist() for column in columns] == [
+            [15000, 1206], [1, 12], [75, 6]]
+        assert packets.codes('SWM').tolist() == [2]
+        for column, values in zip(columns, ([15000, 1206], [1, 12], [75, 6])):
+            assert column.c_contiguous, (
+                'Колонки должны быть непрерывными буферами без копирования.'
+            )
+            assert zlib.crc32(column) == zlib.crc32(array('d', values))
+
+
+def test_columns_for_numpy(tmp_path):
+    numpy = pytest.importorskip('numpy')
+    with packfile.PackFile(write(tmp_path, PACKAGES)) as packets:
+        action = numpy.frombuffer(packets.columns('RUN')[0])
+        assert action.tolist() == [15000, 1206]
+        del action
+
+
+def test_compute_matches_batch(tmp_path):
+    packages = random_packages(500, seed=7)
+    with packfile.PackFile(write(tmp_path, packages)) as packets:
+        results = packets.compute()
+    assert results == batch.compute_packages(packages), (
+        'Расчёт по двоичному файлу должен совпадать с пакетным расчётом.'
+    )
+
+
+def test_write_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        packfile.write_packets(io.BytesIO(), [('BIKE', [1, 1, 1])])
+
+
+def test_bad_magic(tmp_path):
+    path = tmp_path / 'bad.bin'
+    path.write_bytes(struct.pack('<4sHHQ', b'NOPE', 1, 0, 0))
+    with pytest.raises(ValueError):
+        packfile.PackFile(str(path))
+
+
+@pytest.mark.parametrize('cut', [16, 80, 100])
+def test_truncated_file(tmp_path, cut):
+    path = write(tmp_path, [('RUN', [15000, 1, 75])] * 3)
+    with open(path, 'rb') as source:
+        data = source.read()
+    with open(path, 'wb') as sink:
+        sink.write(data[:-cut])
+    with pytest.raises(ValueError):
+        packfile.PackFile(path)
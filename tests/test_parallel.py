@@ -0,0 +1,44 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import Capturing
+
+import parallel
+import stream
+
+LINES = [
+    '["SWM", [720, 1, 80, 25, 40]]\n',
+    '["RUN", [15000, 1, 75]]\n',
+    '["WLK", [9000, 1, 75, 180]]\n',
+    '["RUN", [1206, 12, 6]]\n',
+    '["SWM", [420, 4, 20, 42, 4]]\n',
+] * 7
+
+
+def expected_output():
+    with Capturing() as output:
+        stream.run(LINES)
+    return output
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100])
+def test_process_keeps_order(chunk_size):
+    out = io.StringIO()
+    count = parallel.process(LINES, out, workers=2, chunk_size=chunk_size)
+    assert count == len(LINES)
+    assert out.getvalue().splitlines() == expected_output(), (
+        'Параллельная обработка должна выводить сообщения в порядке входа.'
+    )
+
+
+def test_process_with_executor():
+    out = io.StringIO()
+    with ThreadPoolExecutor(3) as executor:
+        parallel.process(LINES, out, executor=executor, workers=3,
+                         chunk_size=2)
+    assert out.getvalue().splitlines() == expected_output()
+
+
+def test_process_lines_empty():
+    assert parallel.process_lines(['\n'], 'jsonl') == (0, '')
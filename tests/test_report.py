@@ -0,0 +1,45 @@
+import io
+
+import pytest
+from conftest import random_packages
+
+import batch
+import homework
+import report
+
+PACKAGES = random_packages(300, seed=3)
+
+
+def test_format_messages_matches_get_message():
+    infos = [homework.read_package(*package).show_training_info()
+             for package in PACKAGES]
+    assert list(report.format_messages(infos)) == [
+        info.get_message() for info in infos
+    ], 'Массовый вывод должен совпадать с `get_message`.'
+
+
+@pytest.mark.parametrize('batch_size', [1, 7, 10000])
+def test_write_messages(batch_size):
+    infos = [homework.read_package(*package).show_training_info()
+             for package in PACKAGES]
+    sink = io.StringIO()
+    assert report.write_messages(infos, sink, batch_size) == len(infos)
+    assert sink.getvalue() == ''.join(
+        info.get_message() + '\n' for info in infos)
+
+
+def test_write_batch():
+    results = batch.compute_packages(PACKAGES)
+    for workout_type, result in results.items():
+        sink = io.StringIO()
+        assert report.write_batch(result, sink) == len(result)
+        expected = [homework.read_package(*package).show_training_info()
+                    for package in PACKAGES if package[0] == workout_type]
+        assert sink.getvalue().splitlines() == [
+            info.get_message() for info in expected]
+
+
+def test_write_lines_empty():
+    sink = io.StringIO()
+    assert report.write_lines([], sink) == 0
+    assert sink.getvalue() == ''
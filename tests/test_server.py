@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+
+
+def test_handle_packet():
+    reply = json.loads(server.handle_packet(b'["RUN", [15000, 1, 75]]'))
+    assert reply == {'message': (
+        'Тип тренировки: Running; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 9.750 км; '
+        'Ср. скорость: 9.750 км/ч; '
+        'Потрачено ккал: 699.750.'
+    )}
+    reply = json.loads(server.handle_packet(b'["RUN", [15000, 1, 75]]',
+                                            'fields'))
+    assert reply['training_type'] == 'Running'
+    assert reply['calories'] == 699.75
+
+
+@pytest.mark.parametrize('line', [
+    b'["BIKE", [1, 1, 1]]',
+    b'["RUN", [15000, 0, 75]]',
+    b'not json',
+    b'["WLK", [9000, 1e-300, 75, 180]]',
+])
+def test_handle_packet_error(line):
+    assert 'error' in json.loads(server.handle_packet(line)), (
+        'Сервер должен отвечать ошибкой, а не обрывать соединение.'
+    )
+
+
+async def exchange(open_connection):
+    reader, writer = await open_connection()
+    writer.write(b'["SWM", [720, 1, 80, 25, 40]]\n\n["BIKE", [1]]\n')
+    await writer.drain()
+    first = json.loads(await reader.readline())
+    second = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return first, second
+
+
+def test_tcp_server():
+    async def scenario():
+        training_server = server.TrainingServer('fields', queue_size=2)
+        tcp = await training_server.start_tcp()
+        port = tcp.sockets[0].getsockname()[1]
+        replies = await exchange(
+            lambda: asyncio.open_connection('127.0.0.1', port))
+        stats = await server.load(20, 5, port=port)
+        await training_server.close()
+        return replies, stats
+
+    (first, second), stats = asyncio.run(scenario())
+    assert first['training_type'] == 'Swimming'
+    assert 'error' in second
+    assert stats['packets'] == 100
+
+
+def test_unix_server(tmp_path):
+    path = str(tmp_path / 'training.sock')
+
+    async def scenario():
+        training_server = server.TrainingServer()
+        await training_server.start_unix(path)
+        replies = await exchange(
+            lambda: asyncio.open_unix_connection(path))
+        stats = await server.load(10, 3, path=path)
+        await training_server.close()
+        return replies, stats
+
+    (first, _), stats = asyncio.run(scenario())
+    assert first['message'].startswith('Тип тренировки: Swimming;')
+    assert stats['packets'] == 30
+
+
+def test_bad_packets_do_not_stop_workers():
+    async def scenario():
+        training_server = server.TrainingServer('fields', workers=1)
+        tcp = await training_server.start_tcp()
+        port = tcp.sockets[0].getsockname()[1]
+        replies = []
+        for line in (b'["WLK", [9000, 1e-300, 75, 180]]\n',
+                     b'["RUN", [15000, 1, 75]]\n'):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(line)
+            await writer.drain()
+            replies.append(json.loads(
+                await asyncio.wait_for(reader.readline(), 5)))
+            writer.close()
+            await writer.wait_closed()
+        await training_server.close()
+        return replies
+
+    overflow, good = asyncio.run(scenario())
+    assert overflow['error'].startswith('OverflowError')
+    assert good['training_type'] == 'Running', (
+        'После ошибки в пакете сервер должен отвечать другим клиентам.'
+    )
+
+
+def test_non_finite_fields_are_null():
+    def strict(constant):
+        raise ValueError(f'{constant} — не JSON')
+    reply = json.loads(server.handle_packet(b'["RUN", [15000, 1e-320, 75]]',
+                                            'fields'),
+                       parse_constant=strict)
+    assert reply['speed'] is None and reply['calories'] is None, (
+        'Бесконечные показатели должны передаваться как null.'
+    )
+    assert reply['distance'] == 9.75
+
+
+def test_line_over_limit():
+    async def scenario():
+        training_server = server.TrainingServer('fields', workers=1)
+        tcp = await training_server.start_tcp()
+        port = tcp.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'["RUN", [' + b' ' * 100000 + b'15000, 1, 75]]\n')
+        await writer.drain()
+        reply = json.loads(await asyncio.wait_for(reader.readline(), 5))
+        try:
+            tail = await asyncio.wait_for(reader.read(), 5)
+        except ConnectionResetError:
+            tail = b''
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionResetError:
+            pass
+        await training_server.close()
+        return reply, tail
+
+    reply, tail = asyncio.run(scenario())
+    assert reply['error'].startswith('ValueError'), (
+        'На слишком длинную строку сервер должен ответить ошибкой.'
+    )
+    assert tail == b''
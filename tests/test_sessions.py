@@ -0,0 +1,47 @@
+import pytest
+
+import homework
+import sessions
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def test_slots():
+    for cls in (homework.InfoMessage, homework.Training, homework.Running,
+                homework.SportsWalking, homework.Swimming):
+        assert '__slots__' in vars(cls), (
+            f'Класс `{cls.__name__}` должен объявлять `__slots__`.'
+        )
+    info = homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    with pytest.raises(AttributeError):
+        info.extra = 1
+
+
+def test_session_log_matches_objects():
+    log = sessions.SessionLog()
+    for workout_type, data in PACKAGES:
+        log.append(workout_type, data)
+    assert len(log) == len(PACKAGES)
+    for (workout_type, data), stored, info in zip(PACKAGES, log, log.infos()):
+        training = homework.read_package(workout_type, data)
+        assert type(stored) is type(training)
+        assert info == training.show_training_info(), (
+            'Записи журнала должны давать те же сообщения, что и объекты.'
+        )
+    assert log.package(2) == ('WLK', [9000, 1, 75, 180])
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('BIKE', [1, 1, 1]),
+    ('RUN', [1, 1]),
+    ('SWM', [720, 1, 80, 25]),
+])
+def test_session_log_rejects(workout_type, data):
+    log = sessions.SessionLog()
+    with pytest.raises(ValueError):
+        log.append(workout_type, data)
+    assert len(log) == 0
@@ -0,0 +1,95 @@
+import json
+import math
+import pickle
+import random
+
+import pytest
+from conftest import random_packages
+
+import homework
+import sketch
+
+
+def exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_relative_error(seed):
+    rnd = random.Random(seed)
+    values = [rnd.lognormvariate(0, 2) * rnd.choice((-1, 1))
+              for _ in range(5000)] + [0.0] * 50
+    quantiles = sketch.QuantileSketch(0.01)
+    quantiles.update(values)
+    for q in (0, 0.01, 0.25, 0.5, 0.9, 0.99, 1):
+        expected = exact(values, q)
+        assert quantiles.quantile(q) == pytest.approx(
+            expected, rel=0.01, abs=1e-12), (
+            f'Квантиль {q} должен укладываться в относительную погрешность.'
+        )
+
+
+def test_merge_matches_single_sketch():
+    rnd = random.Random(2)
+    values = [rnd.uniform(-100, 1000) for _ in range(2000)]
+    whole = sketch.QuantileSketch()
+    whole.update(values)
+    left, right = sketch.QuantileSketch(), sketch.QuantileSketch()
+    left.update(values[:700])
+    right.update(values[700:])
+    right = pickle.loads(pickle.dumps(right))
+    left.merge(right)
+    restored = sketch.QuantileSketch.from_dict(
+        json.loads(json.dumps(left.to_dict())))
+    for q in (0.1, 0.5, 0.99):
+        assert restored.quantile(q) == whole.quantile(q)
+    with pytest.raises(ValueError):
+        left.merge(sketch.QuantileSketch(0.05))
+
+
+def test_bounded_buckets():
+    quantiles = sketch.QuantileSketch(0.01, max_buckets=32)
+    quantiles.update(float(2 ** power) for power in range(200))
+    assert len(quantiles.positive) <= 32
+    assert quantiles.count == 200
+    assert quantiles.quantile(1) == 2.0 ** 199
+
+
+def test_empty_sketch():
+    assert sketch.QuantileSketch().quantile(0.5) is None
+    with pytest.raises(ValueError):
+        sketch.QuantileSketch().quantile(2)
+
+
+def test_non_finite_values():
+    quantiles = sketch.QuantileSketch()
+    for value in (math.inf, -math.inf, math.nan, 1.0, 2.0, 3.0):
+        quantiles.add(value)
+    assert quantiles.non_finite == 3, (
+        'inf и NaN должны учитываться отдельно, а не среди значений.'
+    )
+    assert quantiles.count == 3 and quantiles.zero_count == 0
+    assert quantiles.quantile(1) == 3.0
+    restored = sketch.QuantileSketch.from_dict(
+        json.loads(json.dumps(quantiles.to_dict())))
+    restored.merge(quantiles)
+    assert restored.non_finite == 6
+    running = sketch.WorkoutSketches()
+    running.add(homework.read_package('RUN', [15000, 1e-320, 75]))
+    assert running.sketches['Running']['speed'].non_finite == 1
+
+
+def test_workout_sketches():
+    packages = random_packages(600, seed=5)
+    trainings = [homework.read_package(*package) for package in packages]
+    first, second = sketch.WorkoutSketches(), sketch.WorkoutSketches()
+    for index, training in enumerate(trainings):
+        (first if index % 2 else second).add(training)
+    first.merge(second)
+    report = first.report()
+    assert set(report) == {'Running', 'SportsWalking', 'Swimming'}
+    calories = [training.get_spent_calories() for training in trainings
+                if type(training).__name__ == 'Running']
+    assert report['Running']['calories'][0.5] == pytest.approx(
+        exact(calories, 0.5), rel=0.01)
@@ -0,0 +1,129 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from conftest import random_packages
+
+import homework
+import store
+
+
+@pytest.fixture
+def archive(tmp_path):
+    packages = random_packages(100, seed=5)
+    path = tmp_path / 'archive.jsonl'
+    path.write_text(''.join(json.dumps(package) + '\n'
+                            for package in packages), encoding='utf-8')
+    return str(path), packages
+
+
+def stored(directory, path):
+    with store.ResultStore(directory) as results:
+        return [info for _, info in sorted(
+            results.results(os.path.abspath(path)).items())]
+
+
+def expected(packages):
+    return [homework.read_package(*package).show_training_info()
+            for package in packages]
+
+
+def test_coefficients_version(monkeypatch):
+    version = store.coefficients_version(homework.Running)
+    assert version == store.coefficients_version(homework.Running)
+    assert version != store.coefficients_version(homework.SportsWalking)
+    monkeypatch.setattr(homework.Training, 'M_IN_KM', 1001)
+    assert store.coefficients_version(homework.Running) != version, (
+        'Версия должна меняться вместе с константами базового класса.'
+    )
+
+    class Patched(homework.Running):
+        def get_spent_calories(self):
+            return 0.0
+    assert (store.coefficients_version(Patched)
+            != store.coefficients_version(homework.Running))
+
+
+VERSION_SCRIPT = """
+import json
+import homework
+import store
+
+class Tagged(homework.Running):
+    TAGS = frozenset(('бег', 'улица', 'утро', 'интервалы'))
+
+versions = store.current_versions()
+versions['Tagged'] = store.coefficients_version(Tagged)
+print(json.dumps(versions))
+"""
+
+
+def test_version_is_stable_across_processes():
+    outputs = []
+    for seed in ('1', '2'):
+        environment = dict(os.environ, PYTHONHASHSEED=seed)
+        outputs.append(subprocess.run(
+            [sys.executable, '-c', VERSION_SCRIPT], capture_output=True,
+            check=True, cwd=os.path.dirname(store.__file__),
+            env=environment, text=True).stdout)
+    assert outputs[0] == outputs[1], (
+        'Версия коэффициентов не должна зависеть от запуска интерпретатора.'
+    )
+
+
+def test_reprocess_and_resume_after_finish(tmp_path, archive):
+    path, packages = archive
+    directory = str(tmp_path / 'store')
+    with store.ResultStore(directory) as results:
+        summary = store.reprocess(path, results)
+    assert summary == {'start': 0, 'computed': 100, 'skipped': 0}
+    assert stored(directory, path) == expected(packages)
+    with store.ResultStore(directory) as results:
+        summary = store.reprocess(path, results)
+    assert summary['computed'] == 0, (
+        'Обработанный архив не должен пересчитываться.'
+    )
+
+
+def test_resume_after_crash(tmp_path, archive, monkeypatch):
+    path, packages = archive
+    directory = str(tmp_path / 'store')
+    calls = []
+
+    def crashing(workout_type, data):
+        calls.append(workout_type)
+        if len(calls) > 25:
+            raise RuntimeError('сбой')
+        return homework.read_package(workout_type, data)
+    monkeypatch.setattr(store, 'read_package', crashing)
+    with pytest.raises(RuntimeError):
+        with store.ResultStore(directory) as results:
+            store.reprocess(path, results, checkpoint_every=10)
+    monkeypatch.undo()
+    with open(str(tmp_path / 'store' / store.RESULTS), 'a') as results:
+        results.write('{"source": "оборвано')
+    with store.ResultStore(directory) as results:
+        summary = store.reprocess(path, results, checkpoint_every=10)
+    assert summary['start'] > 0
+    assert summary['skipped'] == 5, (
+        'Результаты, записанные после контрольной точки, не пересчитываются.'
+    )
+    assert summary['computed'] == 75
+    assert stored(directory, path) == expected(packages)
+
+
+def test_formula_change_recomputes_only_changed_type(
+        tmp_path, archive, monkeypatch):
+    path, packages = archive
+    directory = str(tmp_path / 'store')
+    with store.ResultStore(directory) as results:
+        store.reprocess(path, results)
+    monkeypatch.setattr(homework.Running, 'COEFF_CALORIE_1', 19)
+    with store.ResultStore(directory) as results:
+        summary = store.reprocess(path, results)
+    runs = sum(workout_type == 'RUN' for workout_type, _ in packages)
+    assert summary == {'start': 0, 'computed': runs,
+                       'skipped': len(packages) - runs}
+    assert stored(directory, path) == expected(packages)
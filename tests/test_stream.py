@@ -0,0 +1,55 @@
+import itertools
+
+import pytest
+from conftest import Capturing
+
+import stream
+
+EXPECTED = [
+    'Тип тренировки: Swimming; '
+    'Длительность: 1.000 ч.; '
+    'Дистанция: 0.994 км; '
+    'Ср. скорость: 1.000 км/ч; '
+    'Потрачено ккал: 336.000.',
+    'Тип тренировки: Running; '
+    'Длительность: 1.000 ч.; '
+    'Дистанция: 9.750 км; '
+    'Ср. скорость: 9.750 км/ч; '
+    'Потрачено ккал: 699.750.',
+]
+
+
+@pytest.mark.parametrize('lines, fmt', [
+    (['["SWM", [720, 1, 80, 25, 40]]\n', '\n',
+      '{"workout_type": "RUN", "data": [15000, 1, 75]}\n'], 'jsonl'),
+    (['SWM,720,1,80,25,40\n', 'RUN,15000,1.0,75\n'], 'csv'),
+])
+@pytest.mark.parametrize('chunk_size', [1, 2, 100])
+def test_run(lines, fmt, chunk_size):
+    with Capturing() as output:
+        count = stream.run(lines, fmt, chunk_size)
+    assert count == 2
+    assert output == EXPECTED, (
+        'Потоковая обработка должна печатать те же сообщения, что и `main`.'
+    )
+
+
+def test_iter_packets_is_lazy():
+    lines = itertools.repeat('["RUN", [15000, 1, 75]]')
+    packets = stream.iter_packets(lines)
+    assert next(packets) == ('RUN', [15000, 1, 75])
+
+
+def test_iter_chunks():
+    chunks = list(stream.iter_chunks(range(5), 2))
+    assert chunks == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        next(stream.iter_chunks(range(5), 0))
+
+
+def test_cli(tmp_path):
+    path = tmp_path / 'packages.csv'
+    path.write_text('SWM,720,1,80,25,40\nRUN,15000,1,75\n', encoding='utf-8')
+    with Capturing() as output:
+        assert stream.cli([str(path)]) == 0
+    assert output == EXPECTED
@@ -0,0 +1,73 @@
+import sys
+import threading
+
+import pytest
+from conftest import random_packages
+
+import cache
+import homework
+import threaded
+
+
+class Cycling(homework.Running):
+    __slots__ = ()
+
+
+@pytest.fixture
+def contention():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_pool_matches_single_thread():
+    packages = random_packages(2000, seed=8)
+    expected = threaded.compute_chunk(packages)
+    with threaded.TrainingPool(workers=4, chunk_size=64) as pool:
+        assert pool.compute(packages) == expected
+        assert pool.submit(packages[:10]).result() == expected[:10]
+    with pytest.raises(ValueError):
+        threaded.TrainingPool(chunk_size=0)
+
+
+def test_stress_shared_cache_and_registry(contention):
+    # повторы пакетов и маленький кэш дают и попадания, и вытеснения
+    packages = random_packages(300, seed=9) * 4
+    expected = threaded.compute_chunk(packages)
+    shared = cache.ResultCache(128)
+    results, errors = {}, []
+    stop = threading.Event()
+
+    def churn_registry():
+        while not stop.is_set():
+            homework.register_training('CYC', Cycling)
+            homework.unregister_training('CYC')
+
+    def service(index, pool):
+        try:
+            results[index] = pool.compute(packages[index:] + packages[:index])
+        except Exception as error:
+            errors.append(error)
+
+    churn = threading.Thread(target=churn_registry)
+    churn.start()
+    with threaded.TrainingPool(workers=8, chunk_size=16,
+                               cache=shared) as pool:
+        callers = [threading.Thread(target=service, args=(index, pool))
+                   for index in range(8)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+    stop.set()
+    churn.join()
+    assert not errors
+    for index, infos in results.items():
+        assert infos == expected[index:] + expected[:index], (
+            'Многопоточный расчёт должен совпадать с однопоточным.'
+        )
+    stats = shared.stats()
+    assert stats['hits'] + stats['misses'] == 8 * len(packages)
+    assert stats['size'] <= 128
+    assert 'CYC' not in homework.TRAINING_TYPES
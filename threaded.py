@@ -0,0 +1,94 @@
+"""Потокобезопасный расчёт пачек пакетов в пуле потоков.
+
+Точка входа для многопоточных сервисов. `TrainingPool` держит
+`ThreadPoolExecutor`, режет пакеты на пачки и возвращает сообщения
+в порядке пакетов. Каждая пачка создаёт собственные объекты тренировок,
+поэтому общего изменяемого состояния у потоков нет. Реестр типов читается
+без блокировок, а регистрация нового типа берёт блокировку реестра.
+Общий `cache.ResultCache` можно передать пулу: он разделён на сегменты
+по хешу пакета, у каждого своя блокировка, которая держится только на
+время обращения к словарю сегмента.
+
+При обычной сборке CPython потоки выполняют байт-код по очереди, и пул
+ускоряет расчёт только вместе с вводом-выводом сервиса. На сборках без
+GIL (free-threaded, 3.13t и новее) пачки считаются по-настоящему
+параллельно: на пути расчёта нет общих блокировок, а потоки с общим
+кэшем сталкиваются, только когда их пакеты попадают в один сегмент.
+
+Экземпляр `Training` нельзя менять в одном потоке, пока другой читает
+его показатели: запомненный результат может оказаться посчитанным по
+старым данным.
+"""
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional
+
+from cache import ResultCache
+from homework import InfoMessage, read_package
+from stream import Package, iter_chunks
+
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def compute_chunk(packages: List[Package],
+                  cache: Optional[ResultCache] = None) -> List[InfoMessage]:
+    """Посчитать сообщения для пачки пакетов в текущем потоке."""
+    if cache is not None:
+        return [cache.get_info(workout_type, data)
+                for workout_type, data in packages]
+    return [read_package(workout_type, data).show_training_info()
+            for workout_type, data in packages]
+
+
+class TrainingPool:
+    """Пул потоков для расчёта пакетов, общий для всего сервиса.
+
+    Методы можно вызывать из любых потоков одновременно.
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 cache: Optional[ResultCache] = None,
+                 ) -> None:
+        if chunk_size < 1:
+            raise ValueError('размер пачки должен быть положительным')
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(
+            self.workers, thread_name_prefix='training')
+
+    def __enter__(self) -> 'TrainingPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Дождаться начатых пачек и остановить потоки."""
+        self.executor.shutdown(wait=True)
+
+    def submit(self, packages: List[Package]) -> 'Future[List[InfoMessage]]':
+        """Поставить одну пачку в очередь и вернуть Future с сообщениями."""
+        return self.executor.submit(compute_chunk, packages, self.cache)
+
+    def iter_infos(self, packages: Iterable[Package]) -> Iterator[InfoMessage]:
+        """Лениво считать пакеты пачками, сохраняя их порядок.
+
+        В работе держится не больше двух пачек на поток, поэтому расход
+        памяти не зависит от длины входа.
+        """
+        window = 2 * self.workers
+        pending: Deque[Future] = deque()
+        for chunk in iter_chunks(packages, self.chunk_size):
+            pending.append(self.submit(chunk))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def compute(self, packages: Iterable[Package]) -> List[InfoMessage]:
+        """Посчитать все пакеты и вернуть сообщения по порядку."""
+        return list(self.iter_infos(packages))